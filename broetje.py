@@ -0,0 +1,54 @@
+"""Use the Brötje polling engine and tools without Home Assistant.
+
+The package __init__ holds the Home Assistant entry points. Importing this
+module registers custom_components.broetje_heating without running its
+__init__, so the engine, the device definitions and the tools built on them
+import directly, with only pymodbus installed:
+
+    import broetje
+    from custom_components.broetje_heating.stream import BroetjeStream
+
+The command-line tools run through it:
+
+    python broetje.py cli 192.168.1.100 once
+    python broetje.py capture poll.brcap
+    python broetje.py analytics poll.brcap
+    python broetje.py fleet gateways.json
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+
+PACKAGE = "custom_components.broetje_heating"
+TOOLS = ("analytics", "capture", "cli", "fleet")
+
+
+def register_package() -> None:
+    """Register the integration package without running its __init__."""
+    if PACKAGE in sys.modules:
+        return
+    path = Path(__file__).resolve().parent / "custom_components" / "broetje_heating"
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE, path / "__init__.py", submodule_search_locations=[str(path)]
+    )
+    sys.modules[PACKAGE] = importlib.util.module_from_spec(spec)
+    importlib.import_module("custom_components").broetje_heating = sys.modules[PACKAGE]
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run one of the command-line tools."""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in TOOLS:
+        print(f"usage: python broetje.py {{{','.join(TOOLS)}}} ...", file=sys.stderr)
+        return 2
+    return importlib.import_module(f"{PACKAGE}.{argv[0]}").main(argv[1:])
+
+
+register_package()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,11 +10,20 @@ from pathlib import Path
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
-
-from .const import CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+from homeassistant.helpers.typing import ConfigType
+
+from .const import (
+    CONF_MAX_STALENESS,
+    CONF_SCAN_INTERVAL,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+)
 from .coordinator import BroetjeModbusCoordinator
 from .devices import CONF_DEVICE_TYPE, DeviceType
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,9 +32,17 @@ PLATFORMS: list[Platform] = [
     Platform.BINARY_SENSOR,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 type BroetjeConfigEntry = ConfigEntry[BroetjeModbusCoordinator]
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Brötje Heatpump integration."""
+    async_setup_services(hass)
+    return True
+
+
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Migrate old config entries to new format."""
     if config_entry.version > 3:
@@ -76,6 +93,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: BroetjeConfigEntry) -> b
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    await coordinator.async_update_proxy()
+
     # Clean up orphaned zone sub-devices when zone_count has been reduced
     _cleanup_orphan_zone_devices(hass, entry)
 
@@ -114,6 +133,10 @@ async def _async_update_options(hass: HomeAssistant, entry: BroetjeConfigEntry)
     coordinator: BroetjeModbusCoordinator = entry.runtime_data
     scan_interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
     coordinator.update_scan_interval(scan_interval)
+    max_staleness = entry.options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS)
+    coordinator.update_max_staleness(max_staleness)
+    coordinator.update_history()
+    await coordinator.async_update_proxy()
 
 
 def _copy_images_to_www(hass: HomeAssistant) -> None:
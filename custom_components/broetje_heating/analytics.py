@@ -0,0 +1,261 @@
+"""Vectorised daily statistics over capture files.
+
+Works on whole columns of a capture (see capture.py) with NumPy, so a month
+of samples is summarised in well under a second:
+
+    python broetje.py analytics poll.brcap
+
+prints per day the energy consumed and heat delivered with the resulting
+COP, compressor starts, defrosts and per-zone pump hours and starts, for
+the registers the capture contains. NumPy is not needed by the
+integration itself; install it to use this module.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError as err:
+    raise ImportError("Capture analytics need NumPy: pip install numpy") from err
+
+from .capture import CaptureFormatError, CaptureReader
+from .const import ANALYTICS_MAX_GAP
+from .devices.iwr import IWR_SUB_STATUS
+
+# Sub status codes of the IWR heat pump while defrosting
+DEFROST_SUB_STATUS: frozenset[int] = frozenset(
+    code for code, name in IWR_SUB_STATUS.items() if name.startswith("defrost")
+)
+
+_ZONE_COUNTER = re.compile(r"zone(\d+)_pump_(hours|starts)")
+
+type Daily = tuple[np.ndarray, np.ndarray]
+
+
+def decode_column(reader: CaptureReader, register_key: str) -> np.ndarray:
+    """Return a register's values as float64, NaN where there was no data.
+
+    Applies the same signedness, sentinel and scale rules as a poll
+    (engine.decode_register) to the whole column at once. Samples where the
+    register was not read are NaN too.
+    """
+    config = reader.registers[register_key]
+    data_type = config.get("data_type", "int16")
+    if data_type == "string":
+        raise ValueError(f"{register_key} is not numeric")
+    words = [
+        np.frombuffer(column, dtype=np.uint16) for column in reader.raw(register_key)
+    ]
+
+    if data_type in ("int32", "uint32"):
+        raw = words[0].astype(np.int64) << 16 | words[1]
+        missing = raw == 0xFFFFFFFF
+        if data_type == "int32":
+            raw = np.where(raw >= 1 << 31, raw - (1 << 32), raw)
+    else:
+        raw = words[0].astype(np.int64)
+        missing = raw == 0xFFFF
+        if data_type == "int16":
+            raw = np.where(raw >= 1 << 15, raw - (1 << 16), raw)
+
+    if data_type == "bool":
+        raw = (raw != 0).astype(np.int64)
+    if data_type not in ("int16", "uint16", "int32", "uint32"):
+        # Bools and bitfields have no "no data" value of their own
+        missing = np.zeros_like(missing)
+    missing |= np.frombuffer(reader.valid(register_key), dtype=np.uint8) == 0
+    scale = 1 if data_type in ("bool", "bitfield") else config.get("scale", 1.0)
+
+    values = raw * np.float64(scale)
+    values[missing] = np.nan
+    return values
+
+
+def _days(timestamps: np.ndarray, utc_offset: float) -> np.ndarray:
+    """Return the calendar day of each timestamp at the given UTC offset."""
+    return ((timestamps + utc_offset) // 86400).astype(np.int64).astype("datetime64[D]")
+
+
+def _per_day(days: np.ndarray, values: np.ndarray) -> Daily:
+    """Return the distinct days and the sum of the values on each."""
+    unique, index = np.unique(days, return_inverse=True)
+    return unique, np.bincount(index, weights=values, minlength=len(unique))
+
+
+def daily_increase(
+    reader: CaptureReader, register_key: str, utc_offset: float = 0
+) -> Daily:
+    """Return how much a counter register increased on each day.
+
+    Every increase between two consecutive valid samples counts on the day
+    of the later one. Decreases (a counter reset or replaced board) count
+    as zero.
+    """
+    timestamps = np.asarray(reader.timestamps())
+    values = decode_column(reader, register_key)
+    valid = ~np.isnan(values)
+    timestamps, values = timestamps[valid], values[valid]
+    if len(values) < 2:
+        return np.array([], dtype="datetime64[D]"), np.array([])
+    increase = np.clip(np.diff(values), 0, None)
+    return _per_day(_days(timestamps[1:], utc_offset), increase)
+
+
+def daily_cop(reader: CaptureReader, utc_offset: float = 0) -> dict[str, np.ndarray]:
+    """Return energy consumed, heat delivered (kWh) and their ratio per day.
+
+    From the total_energy_consumed and total_thermal_delivered counters.
+    The COP is NaN on days without consumption.
+    """
+    days, consumed = daily_increase(reader, "total_energy_consumed", utc_offset)
+    thermal_days, delivered = daily_increase(
+        reader, "total_thermal_delivered", utc_offset
+    )
+    # Align both counters on the days either has samples for
+    all_days = np.union1d(days, thermal_days)
+    energy = np.zeros(len(all_days))
+    thermal = np.zeros(len(all_days))
+    energy[np.searchsorted(all_days, days)] = consumed
+    thermal[np.searchsorted(all_days, thermal_days)] = delivered
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cop = np.where(energy > 0, thermal / energy, np.nan)
+    return {"day": all_days, "energy": energy, "thermal": thermal, "cop": cop}
+
+
+def daily_defrosts(
+    reader: CaptureReader, utc_offset: float = 0
+) -> dict[str, np.ndarray]:
+    """Return the number of defrosts and minutes spent defrosting per day.
+
+    A defrost starts where the IWR sub_status changes to a defrost code. Time
+    between two samples counts towards the state of the earlier one, except
+    across gaps longer than ANALYTICS_MAX_GAP seconds.
+    """
+    timestamps = np.asarray(reader.timestamps())
+    status = decode_column(reader, "sub_status")
+    valid = ~np.isnan(status)
+    timestamps, status = timestamps[valid], status[valid]
+    if len(status) < 2:
+        empty = np.array([])
+        return {
+            "day": np.array([], dtype="datetime64[D]"),
+            "defrosts": empty,
+            "minutes": empty,
+        }
+
+    defrosting = np.isin(status, list(DEFROST_SUB_STATUS))
+    started = defrosting[1:] & ~defrosting[:-1]
+    intervals = np.diff(timestamps)
+    seconds = np.where(defrosting[:-1] & (intervals <= ANALYTICS_MAX_GAP), intervals, 0)
+    days = _days(timestamps[1:], utc_offset)
+    unique, defrosts = _per_day(days, started.astype(np.float64))
+    _, defrost_seconds = _per_day(days, seconds)
+    return {"day": unique, "defrosts": defrosts, "minutes": defrost_seconds / 60}
+
+
+def zone_counters(reader: CaptureReader) -> dict[int, dict[str, str]]:
+    """Return the pump hours/starts registers (CC001/CC010) per zone number."""
+    zones: dict[int, dict[str, str]] = {}
+    for key in reader.registers:
+        if match := _ZONE_COUNTER.fullmatch(key):
+            zones.setdefault(int(match[1]), {})[match[2]] = key
+    return dict(sorted(zones.items()))
+
+
+def report(reader: CaptureReader, utc_offset: float = 0) -> dict[str, dict[str, Any]]:
+    """Return every statistic the capture's registers allow, per ISO day."""
+    rows: dict[str, dict[str, Any]] = {}
+
+    def add(name: str, daily: Daily) -> None:
+        days, values = daily
+        for day, value in zip(days.astype(str), values.tolist(), strict=True):
+            rows.setdefault(day, {})[name] = None if np.isnan(value) else value
+
+    registers = reader.registers
+    if "total_energy_consumed" in registers and "total_thermal_delivered" in registers:
+        cop = daily_cop(reader, utc_offset)
+        add("energy_kwh", (cop["day"], cop["energy"]))
+        add("thermal_kwh", (cop["day"], cop["thermal"]))
+        add("cop", (cop["day"], cop["cop"]))
+    if "total_starts" in registers:
+        add("compressor_starts", daily_increase(reader, "total_starts", utc_offset))
+    if "sub_status" in registers and reader.device_type == "iwr":
+        defrosts = daily_defrosts(reader, utc_offset)
+        add("defrosts", (defrosts["day"], defrosts["defrosts"]))
+        add("defrost_minutes", (defrosts["day"], defrosts["minutes"]))
+    for zone, counters in zone_counters(reader).items():
+        for kind, key in counters.items():
+            add(f"zone{zone}_pump_{kind}", daily_increase(reader, key, utc_offset))
+
+    return dict(sorted(rows.items()))
+
+
+def _format_table(rows: dict[str, dict[str, Any]]) -> list[str]:
+    """Return the report as lines of a text table, one row per day."""
+    columns = list(dict.fromkeys(name for row in rows.values() for name in row))
+    widths = [max(len(name), 8) for name in columns]
+    lines = [
+        "day       "
+        + "".join(
+            f"  {name:>{width}}" for name, width in zip(columns, widths, strict=True)
+        )
+    ]
+    for day, row in rows.items():
+        cells = []
+        for name, width in zip(columns, widths, strict=True):
+            value = row.get(name)
+            cell = "-" if value is None else f"{value:.2f}"
+            cells.append(f"  {cell:>{width}}")
+        lines.append(day + "".join(cells))
+    return lines
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Print daily statistics of a capture file."""
+    parser = argparse.ArgumentParser(
+        prog="python broetje.py analytics",
+        description="Daily statistics of a Brötje capture file.",
+    )
+    parser.add_argument("file", type=Path, help="capture file")
+    parser.add_argument(
+        "--utc-offset",
+        type=float,
+        help="hours from UTC that days start at (default: local time now)",
+    )
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    args = parser.parse_args(argv)
+
+    if args.utc_offset is None:
+        offset = datetime.now().astimezone().utcoffset()
+        utc_offset = offset.total_seconds() if offset is not None else 0
+    else:
+        utc_offset = args.utc_offset * 3600
+
+    try:
+        reader = CaptureReader(args.file)
+    except (OSError, CaptureFormatError) as err:
+        print(err, file=sys.stderr)
+        return 1
+    with reader:
+        rows = report(reader, utc_offset)
+
+    if args.format == "json":
+        json.dump(rows, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    elif rows:
+        print("\n".join(_format_table(rows)))
+    else:
+        print("Nothing to report: no counters or status registers", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -35,6 +35,9 @@ async def async_setup_entry(
     entities: list[BroetjeBinarySensor] = []
 
     for sensor_key, sensor_config in coordinator.binary_sensors.items():
+        # Skip zone entities that do not apply to the zone's type/function
+        if not coordinator.register_applies(sensor_config["register"]):
+            continue
         entities.append(
             BroetjeBinarySensor(
                 coordinator=coordinator,
@@ -63,6 +66,7 @@ class BroetjeBinarySensor(BroetjeEntity, BinarySensorEntity):
         )
 
         self._register_key = sensor_config["register"]
+        self._slot = coordinator.register_slots[self._register_key]
         self._attr_translation_key = sensor_config.get("translation_key", entity_key)
 
         # Support zone number placeholders in translation strings
@@ -84,7 +88,7 @@ class BroetjeBinarySensor(BroetjeEntity, BinarySensorEntity):
         if self.coordinator.data is None:
             return None
 
-        value = self.coordinator.data.get(self._register_key)
+        value = self.coordinator.data[self._slot]
 
         if value is None:
             return None
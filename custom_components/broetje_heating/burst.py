@@ -0,0 +1,106 @@
+"""Short high-frequency captures of a few registers, for diagnostics.
+
+A burst samples a handful of registers (e.g. status codes, flow and return
+temperatures, power) every second or two for a few minutes, to follow
+compressor cycles or defrosts that a normal poll interval hides. Samples go
+to a capture file, not to the slot store, so entities do not see them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from pathlib import Path
+
+from .engine import BroetjeEngine, EngineError
+from .history import RegisterHistory, RegisterReader, sample_size
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BurstCapture:
+    """Sample registers on a short interval for a limited time."""
+
+    def __init__(
+        self,
+        engine: BroetjeEngine,
+        registers: list[str],
+        *,
+        interval: float,
+        duration: float,
+    ) -> None:
+        """Initialize the capture; nothing is read until run()."""
+        self.engine = engine
+        self.registers = list(registers)
+        self.interval = interval
+        self.duration = duration
+        # Room for every tick of the burst, so no sample is overwritten
+        ticks = int(duration // interval) + 1
+        self.samples = RegisterHistory(
+            engine.register_map,
+            self.registers,
+            ticks * sample_size(engine.register_map, self.registers),
+        )
+        # Ticks not sampled because the previous reads took too long
+        self.skipped = 0
+        self.error: str | None = None
+
+    async def run(self) -> None:
+        """Sample until the duration is over or the gateway stops responding."""
+        # One fixed plan for the whole burst: no gates, no batch size probes
+        reads = self.engine.plan_reads(set(self.registers))
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        end = next_tick + self.duration
+        while True:
+            now = loop.time()
+            missed = max(int((now - next_tick) // self.interval), 0)
+            self.skipped += missed
+            next_tick += missed * self.interval
+            if next_tick > end:
+                return
+            await asyncio.sleep(max(next_tick - now, 0))
+            next_tick += self.interval
+
+            try:
+                results = await self.engine.read_raw(reads)
+            except EngineError as err:
+                self.error = str(err)
+                _LOGGER.warning("Burst capture stopped: %s", err)
+                return
+            self.samples.record(time.time(), _reader(results))
+
+    def write(self, path: Path) -> None:
+        """Write the raw samples to a capture file (see capture.py)."""
+        # Imported here so capture.py is not loaded with the package and
+        # runs cleanly with "python -m"
+        from .capture import CaptureWriter
+
+        with CaptureWriter(
+            path,
+            self.engine.register_map,
+            self.registers,
+            device_type=self.engine.device_type,
+        ) as writer:
+            writer.write(*self.samples.query(self.registers))
+
+
+def _reader(
+    results: dict[tuple[str, int, int], list[int] | None],
+) -> RegisterReader:
+    """Return a RegisterHistory reader over the raw words of one tick."""
+
+    def read(register_type: str, address: int, count: int) -> list[int] | None:
+        end = address + count
+        for (reg_type, start, length), words in results.items():
+            if (
+                words is not None
+                and reg_type == register_type
+                and start <= address
+                and end <= start + length
+            ):
+                return words[address - start : end - start]
+        return None
+
+    return read
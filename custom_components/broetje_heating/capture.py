@@ -0,0 +1,346 @@
+"""Columnar capture files of raw register words, for offline analysis.
+
+A capture file holds samples of a fixed set of registers as raw words, one
+column per register address, so weeks of data stay compact and a single
+register can be read without touching the others:
+
+    header    magic b"BRCAP\\0", uint16 version, uint32 header length,
+              then the header as UTF-8 JSON
+    block     uint64 row count n, n float64 timestamps (seconds since the
+              epoch), n uint16 words per column in header order, then n
+              uint8 flags per register in header order, 1 where the
+              register was read
+
+All numbers are little-endian. The header names the device type and embeds
+the descriptors (address, type, count, data type, scale) of the recorded
+registers from devices/, so a file decodes without the integration's
+register maps. Words of samples not read are 0xFFFF, but only the flags
+tell them apart from a bitfield with all bits on. Writers append one block
+at a time; a block cut short by a crash is ignored by readers.
+
+    python broetje.py capture FILE [--registers a,b]
+
+exports a capture as CSV of decoded values.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, BinaryIO, Self
+
+from .engine import decode_register
+from .history import MISSING_WORD
+
+CAPTURE_VERSION = 2
+
+_MAGIC = b"BRCAP\0"
+_PREFIX = struct.Struct("<6sHI")
+_BLOCK = struct.Struct("<Q")
+# Register config keys embedded in the header, enough to decode the words
+_DESCRIPTOR_KEYS = ("address", "type", "count", "data_type", "scale", "bits")
+
+type Column = tuple[str, int]
+
+
+class CaptureFormatError(Exception):
+    """The file is not a capture file this version can read."""
+
+
+def _little_endian(values: array) -> array:
+    """Return the array in little-endian byte order (as stored in files)."""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def _columns(registers: dict[str, dict[str, Any]]) -> list[Column]:
+    """Return the (type, address) columns covering the registers, in order."""
+    columns: dict[Column, None] = {}
+    for config in registers.values():
+        for index in range(config.get("count", 1)):
+            columns[(config["type"], config["address"] + index)] = None
+    return list(columns)
+
+
+class CaptureWriter:
+    """Append samples of a fixed set of registers to a capture file."""
+
+    def __init__(
+        self,
+        path: Path,
+        register_map: dict[str, dict[str, Any]],
+        registers: Sequence[str],
+        *,
+        device_type: str,
+    ) -> None:
+        """Open the file, creating it or checking it records the same registers.
+
+        Raises CaptureFormatError when appending to a file whose registers
+        differ.
+        """
+        self.path = path
+        self.registers: dict[str, dict[str, Any]] = {
+            key: {
+                name: register_map[key][name]
+                for name in _DESCRIPTOR_KEYS
+                if name in register_map[key]
+            }
+            for key in registers
+        }
+        self.columns = _columns(self.registers)
+        self._column_index = {
+            column: index for index, column in enumerate(self.columns)
+        }
+
+        header = {
+            "device_type": str(device_type),
+            "registers": self.registers,
+            "columns": self.columns,
+        }
+        if path.exists() and path.stat().st_size:
+            with CaptureReader(path) as existing:
+                if (
+                    existing.registers != self.registers
+                    or existing.columns != self.columns
+                ):
+                    raise CaptureFormatError(
+                        f"{path} records different registers, not appending"
+                    )
+                end = existing.end
+            # Drop a block cut short by a crash, it would hide the blocks after it
+            self._file: BinaryIO = path.open("r+b")
+            self._file.truncate(end)
+            self._file.seek(end)
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path.open("wb")
+        encoded = json.dumps(header).encode()
+        self._file.write(_PREFIX.pack(_MAGIC, CAPTURE_VERSION, len(encoded)))
+        self._file.write(encoded)
+        self._file.flush()
+
+    def write(
+        self, timestamps: Sequence[float], words: dict[str, list[list[int] | None]]
+    ) -> None:
+        """Append a block of samples.
+
+        Takes the output of RegisterHistory.query(): the timestamps and,
+        per register, the raw words of every sample (None if not read).
+        """
+        rows = len(timestamps)
+        if not rows:
+            return
+        columns = [array("H", [MISSING_WORD]) * rows for _ in self.columns]
+        flags = [array("B", bytes(rows)) for _ in self.registers]
+        for index, (key, config) in enumerate(self.registers.items()):
+            first = self._column_index[(config["type"], config["address"])]
+            for row, sample in enumerate(words[key]):
+                if sample is None:
+                    continue
+                flags[index][row] = 1
+                for offset, word in enumerate(sample):
+                    columns[first + offset][row] = word
+
+        self._file.write(_BLOCK.pack(rows))
+        self._file.write(_little_endian(array("d", timestamps)).tobytes())
+        for column in columns:
+            self._file.write(_little_endian(column).tobytes())
+        for flag in flags:
+            self._file.write(flag.tobytes())
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+    def __enter__(self) -> Self:
+        """Return the writer."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the file."""
+        self.close()
+
+
+class CaptureReader:
+    """Memory-mapped reader of a capture file.
+
+    Columns are copied out of the mapping only when asked for, and values
+    are decoded per register on first access, with the same scale and
+    sentinel rules as a poll.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Map the file and index its blocks; raises CaptureFormatError."""
+        self.path = path
+        with path.open("rb") as file:
+            size = path.stat().st_size
+            if size < _PREFIX.size:
+                raise CaptureFormatError(f"{path} is not a capture file")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_length = _PREFIX.unpack_from(self._map)
+        if magic != _MAGIC:
+            self._map.close()
+            raise CaptureFormatError(f"{path} is not a capture file")
+        if version != CAPTURE_VERSION:
+            self._map.close()
+            raise CaptureFormatError(f"{path} has unsupported version {version}")
+        self.header: dict[str, Any] = json.loads(
+            self._map[_PREFIX.size : _PREFIX.size + header_length]
+        )
+        self.device_type: str = self.header["device_type"]
+        self.registers: dict[str, dict[str, Any]] = self.header["registers"]
+        self.columns: list[Column] = [
+            (register_type, address)
+            for register_type, address in self.header["columns"]
+        ]
+        self._column_index = {
+            column: index for index, column in enumerate(self.columns)
+        }
+        self._register_index = {key: index for index, key in enumerate(self.registers)}
+
+        # (offset of the timestamps, row count) of every complete block
+        self._blocks: list[tuple[int, int]] = []
+        position = _PREFIX.size + header_length
+        while position + _BLOCK.size <= size:
+            (rows,) = _BLOCK.unpack_from(self._map, position)
+            data = position + _BLOCK.size
+            end = data + rows * (8 + 2 * len(self.columns) + len(self.registers))
+            if not rows or end > size:
+                break
+            self._blocks.append((data, rows))
+            position = end
+        # End of the last complete block
+        self.end = position
+        self.rows = sum(rows for _, rows in self._blocks)
+
+        self._words: dict[Column, array] = {}
+        self._valid: dict[str, array] = {}
+        self._values: dict[str, list[Any]] = {}
+        self._timestamps: array | None = None
+
+    def __len__(self) -> int:
+        """Return the number of samples."""
+        return self.rows
+
+    def timestamps(self) -> array:
+        """Return the sample times (float64 seconds since the epoch)."""
+        if self._timestamps is None:
+            values = array("d")
+            for data, rows in self._blocks:
+                values.frombytes(self._map[data : data + 8 * rows])
+            self._timestamps = _little_endian(values)
+        return self._timestamps
+
+    def words(self, register_type: str, address: int) -> array:
+        """Return the raw uint16 column of one register address."""
+        column = (register_type, address)
+        if (values := self._words.get(column)) is None:
+            index = self._column_index[column]
+            values = array("H")
+            for data, rows in self._blocks:
+                start = data + 8 * rows + 2 * rows * index
+                values.frombytes(self._map[start : start + 2 * rows])
+            values = self._words[column] = _little_endian(values)
+        return values
+
+    def raw(self, register_key: str) -> list[array]:
+        """Return the word columns of a register, most significant first."""
+        config = self.registers[register_key]
+        return [
+            self.words(config["type"], config["address"] + index)
+            for index in range(config.get("count", 1))
+        ]
+
+    def valid(self, register_key: str) -> array:
+        """Return a register's uint8 flags, 1 for samples where it was read."""
+        if (values := self._valid.get(register_key)) is None:
+            index = self._register_index[register_key]
+            values = array("B")
+            for data, rows in self._blocks:
+                start = data + rows * (8 + 2 * len(self.columns) + index)
+                values.frombytes(self._map[start : start + rows])
+            self._valid[register_key] = values
+        return values
+
+    def values(self, register_key: str) -> list[Any]:
+        """Return the decoded values of a register, None where not read."""
+        if (values := self._values.get(register_key)) is None:
+            config = self.registers[register_key]
+            values = self._values[register_key] = [
+                decode_register(list(sample), 0, config) if valid else None
+                for valid, *sample in zip(
+                    self.valid(register_key), *self.raw(register_key), strict=True
+                )
+            ]
+        return values
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._words.clear()
+        self._valid.clear()
+        self._timestamps = None
+        self._map.close()
+
+    def __enter__(self) -> Self:
+        """Return the reader."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Unmap the file."""
+        self.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Export a capture file as CSV of decoded values."""
+    parser = argparse.ArgumentParser(
+        prog="python broetje.py capture",
+        description="Export a Brötje capture file as CSV.",
+    )
+    parser.add_argument("file", type=Path, help="capture file")
+    parser.add_argument(
+        "--registers", help="export only these registers, comma-separated"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        reader = CaptureReader(args.file)
+    except (OSError, CaptureFormatError) as err:
+        print(err, file=sys.stderr)
+        return 1
+    with reader:
+        registers = (
+            args.registers.split(",") if args.registers else list(reader.registers)
+        )
+        if unknown := [key for key in registers if key not in reader.registers]:
+            print(f"Not in the capture: {', '.join(unknown)}", file=sys.stderr)
+            return 2
+        columns = [reader.values(key) for key in registers]
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["timestamp", *registers])
+        for index, timestamp in enumerate(reader.timestamps()):
+            writer.writerow(
+                [
+                    f"{timestamp:.3f}",
+                    *(
+                        "" if column[index] is None else column[index]
+                        for column in columns
+                    ),
+                ]
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
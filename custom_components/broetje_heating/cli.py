@@ -0,0 +1,327 @@
+"""Command-line poller for Brötje ISR/IWR modules, without Home Assistant.
+
+    python broetje.py cli HOST once
+    python broetje.py cli HOST --device iwr --zones 1,2 loop
+    python broetje.py cli HOST dump --format csv
+    python broetje.py cli HOST loop --capture poll.brcap
+
+Values go to stdout, timing statistics to stderr, so the output of "dump"
+can be piped or redirected as is. Batch times cover the whole request as
+the poll sees it, including request spacing and retries.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import TextIO
+
+from .capture import CaptureFormatError, CaptureWriter
+from .const import (
+    CAPTURE_FLUSH_ROWS,
+    DEFAULT_PORT,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_UNIT_ID,
+)
+from .devices import DeviceType
+from .engine import BroetjeEngine, EngineError
+from .history import RegisterHistory, sample_size
+
+
+def _parse_zones(value: str) -> list[int]:
+    """Parse a comma-separated zone list such as "1,2,3"."""
+    try:
+        return sorted({int(zone) for zone in value.split(",")})
+    except ValueError as err:
+        raise argparse.ArgumentTypeError(f"invalid zone list: {value}") from err
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="python broetje.py cli",
+        description="Poll a Brötje ISR/IWR module over Modbus TCP.",
+    )
+    parser.add_argument("host", help="Modbus TCP gateway host")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unit-id", type=int, default=DEFAULT_UNIT_ID)
+    parser.add_argument(
+        "--device",
+        type=DeviceType,
+        choices=list(DeviceType),
+        default=DeviceType.ISR,
+        help="register map to use (default: isr)",
+    )
+    parser.add_argument(
+        "--zones",
+        type=_parse_zones,
+        default=[1],
+        help="IWR zones to read, comma-separated (default: 1)",
+    )
+    parser.add_argument(
+        "--registers",
+        help="read only these registers, comma-separated (default: all)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        help="fixed maximum registers per request instead of the learned size",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        help="JSON file to restore and save the learned gateway tuning",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="debug logging")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("once", help="run one poll and print the values")
+    loop = commands.add_parser("loop", help="poll repeatedly and print timings")
+    loop.add_argument(
+        "--interval", type=float, default=DEFAULT_SCAN_INTERVAL, help="seconds"
+    )
+    loop.add_argument("--count", type=int, help="stop after this many polls")
+    loop.add_argument(
+        "--capture",
+        type=Path,
+        help="append the raw words of every poll to this capture file",
+    )
+    dump = commands.add_parser("dump", help="read all registers as JSON or CSV")
+    dump.add_argument("--format", choices=["json", "csv"], default="json")
+    return parser
+
+
+def _print_batch_timings(engine: BroetjeEngine, out: TextIO) -> None:
+    """Print the duration of every batch read in the last poll."""
+    for timing in engine.batch_timings:
+        print(
+            f"  {timing['type']:<7} {timing['address']:>6} x{timing['count']:<4}"
+            f" {timing['duration'] * 1000:8.1f} ms"
+            f"{'' if timing['ok'] else '  FAILED'}",
+            file=out,
+        )
+
+
+def _summary(label: str, durations: list[float]) -> str:
+    """Return min/mean/p95/max of durations in milliseconds."""
+    if not durations:
+        return f"{label}: none"
+    ms = sorted(duration * 1000 for duration in durations)
+    p95 = (
+        statistics.quantiles(ms, n=20, method="inclusive")[-1] if len(ms) > 1 else ms[0]
+    )
+    return (
+        f"{label}: n={len(ms)} min={ms[0]:.1f} mean={statistics.fmean(ms):.1f}"
+        f" p95={p95:.1f} max={ms[-1]:.1f} ms"
+    )
+
+
+def _units(engine: BroetjeEngine) -> dict[str, str]:
+    """Return the unit of measurement per register, from the sensor map."""
+    return {
+        config["register"]: config["unit"]
+        for config in engine.device_config["sensors"].values()
+        if config.get("unit")
+    }
+
+
+def _write_dump(
+    engine: BroetjeEngine, registers: set[str], fmt: str, out: TextIO
+) -> None:
+    """Write the values of the given registers as JSON or CSV."""
+    units = _units(engine)
+    rows = [
+        {
+            "register": key,
+            "type": engine.register_map[key]["type"],
+            "address": engine.register_map[key]["address"],
+            "value": engine.get_value(key),
+            "unit": units.get(key, ""),
+        }
+        for key in sorted(
+            registers, key=lambda key: engine.register_map[key]["address"]
+        )
+    ]
+    if fmt == "json":
+        json.dump(rows, out, indent=2, ensure_ascii=False)
+        out.write("\n")
+        return
+    writer = csv.DictWriter(out, fieldnames=list(rows[0]) if rows else ["register"])
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+async def _timed_poll(engine: BroetjeEngine, registers: set[str]) -> float:
+    """Run one poll and return its duration; raises EngineError on failure."""
+    started = time.monotonic()
+    await engine.poll(registers)
+    return time.monotonic() - started
+
+
+async def _run(args: argparse.Namespace) -> int:
+    """Run the selected command and return the exit code."""
+    engine = BroetjeEngine(
+        args.host,
+        args.port,
+        args.device,
+        args.zones,
+        args.unit_id,
+        poll_interval=getattr(args, "interval", DEFAULT_SCAN_INTERVAL),
+    )
+    if args.profile is not None and args.profile.exists():
+        engine.restore_profile(json.loads(args.profile.read_text()))
+    if args.batch_size is not None:
+        # Known-good and smallest failing size adjacent: nothing left to probe
+        limits = {"good": args.batch_size, "bad": args.batch_size + 1}
+        engine.restore_profile(
+            {
+                **engine.profile(),
+                "batch_limits": {"holding": dict(limits), "input": dict(limits)},
+            }
+        )
+
+    if args.registers:
+        registers = set(args.registers.split(","))
+        if unknown := registers - engine.register_slots.keys():
+            print(f"Unknown registers: {', '.join(sorted(unknown))}", file=sys.stderr)
+            return 2
+    else:
+        registers = engine.all_registers()
+
+    try:
+        started = time.monotonic()
+        await engine.setup()
+        print(f"Setup: {(time.monotonic() - started) * 1000:.1f} ms", file=sys.stderr)
+
+        if args.command == "loop":
+            return await _loop(
+                engine, registers, args.interval, args.count, args.capture
+            )
+
+        duration = await _timed_poll(engine, registers)
+        if args.command == "dump":
+            _write_dump(
+                engine,
+                {engine.poll_key(key) for key in registers},
+                args.format,
+                sys.stdout,
+            )
+        else:
+            for key in sorted(registers):
+                print(f"{key} = {engine.get_value(key)}")
+        print(f"Poll: {duration * 1000:.1f} ms", file=sys.stderr)
+        _print_batch_timings(engine, sys.stderr)
+        print(
+            _summary("Batches", [t["duration"] for t in engine.batch_timings]),
+            file=sys.stderr,
+        )
+    except EngineError as err:
+        print(f"Poll failed: {err}", file=sys.stderr)
+        return 1
+    finally:
+        await engine.close()
+        if args.profile is not None:
+            args.profile.write_text(json.dumps(engine.profile(), indent=2) + "\n")
+    return 0
+
+
+def _open_capture(
+    engine: BroetjeEngine, registers: set[str], path: Path
+) -> tuple[CaptureWriter, RegisterHistory]:
+    """Open a capture file and a buffer of polls for the given registers."""
+    keys = sorted(
+        {engine.poll_key(key) for key in registers},
+        key=lambda key: engine.register_map[key]["address"],
+    )
+    writer = CaptureWriter(
+        path, engine.register_map, keys, device_type=engine.device_type
+    )
+    return writer, RegisterHistory(
+        engine.register_map,
+        keys,
+        CAPTURE_FLUSH_ROWS * sample_size(engine.register_map, keys),
+    )
+
+
+def _flush_capture(writer: CaptureWriter, buffer: RegisterHistory) -> None:
+    """Append the buffered polls to the capture file."""
+    writer.write(*buffer.query(buffer.registers))
+    buffer.clear()
+
+
+async def _loop(
+    engine: BroetjeEngine,
+    registers: set[str],
+    interval: float,
+    count: int | None,
+    capture: Path | None = None,
+) -> int:
+    """Poll on a fixed interval, printing one timing line per poll."""
+    writer: CaptureWriter | None = None
+    if capture is not None:
+        try:
+            writer, buffer = _open_capture(engine, registers, capture)
+        except (OSError, CaptureFormatError) as err:
+            print(f"Cannot open capture file: {err}", file=sys.stderr)
+            return 2
+    poll_durations: list[float] = []
+    batch_durations: list[float] = []
+    failures = 0
+    polls = 0
+    next_poll = time.monotonic()
+    try:
+        # Ctrl+C cancels the loop; the summary is printed either way
+        while count is None or polls < count:
+            await asyncio.sleep(max(next_poll - time.monotonic(), 0))
+            next_poll += interval
+            polls += 1
+            try:
+                duration = await _timed_poll(engine, registers)
+            except EngineError as err:
+                failures += 1
+                print(f"#{polls} failed: {err}", file=sys.stderr)
+                continue
+            poll_durations.append(duration)
+            if writer is not None:
+                buffer.record(time.time(), engine.cached_registers)
+                if len(buffer) == buffer.capacity:
+                    _flush_capture(writer, buffer)
+            batch_durations.extend(t["duration"] for t in engine.batch_timings)
+            failed = sum(not t["ok"] for t in engine.batch_timings)
+            print(
+                f"#{polls} {duration * 1000:.1f} ms, {len(engine.batch_timings)}"
+                f" batches ({failed} failed), {len(engine.changed_slots)} changed",
+                file=sys.stderr,
+            )
+    finally:
+        if writer is not None:
+            _flush_capture(writer, buffer)
+            writer.close()
+        print(_summary("Polls", poll_durations), file=sys.stderr)
+        print(_summary("Batches", batch_durations), file=sys.stderr)
+        print(f"Failed polls: {failures}/{polls}", file=sys.stderr)
+    return 1 if polls and failures == polls else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the command-line poller."""
+    args = _build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    try:
+        return asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
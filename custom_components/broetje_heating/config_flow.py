@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 import voluptuous as vol
@@ -22,14 +23,23 @@ from homeassistant.helpers.selector import (
 )
 
 from .const import (
+    CONF_HISTORY_MEMORY,
+    CONF_HISTORY_REGISTERS,
+    CONF_MAX_STALENESS,
+    CONF_PROXY_ENABLED,
+    CONF_PROXY_PORT,
     CONF_SCAN_INTERVAL,
     CONF_UNIT_ID,
+    DEFAULT_HISTORY_MEMORY,
+    DEFAULT_MAX_STALENESS,
     DEFAULT_PORT,
+    DEFAULT_PROXY_PORT,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_UNIT_ID,
     DOMAIN,
+    REG_HOLDING,
 )
-from .devices import CONF_DEVICE_TYPE, DEVICE_MODELS, DeviceType
+from .devices import CONF_DEVICE_TYPE, DEVICE_MODELS, DeviceType, get_device_config
 from .devices.iwr import ZONE_ADDR_OFFSET, ZONE_FUNCTION_BASE_ADDR, ZONE_TYPE_BASE_ADDR
 
 _LOGGER = logging.getLogger(__name__)
@@ -79,9 +89,27 @@ class CannotConnect(Exception):
     """Error to indicate we cannot connect."""
 
 
-async def detect_zones(client: Any, unit_id: int) -> list[dict[str, Any]]:
+type HoldingReader = Callable[[int, int], Awaitable[list[int] | None]]
+
+
+def client_holding_reader(client: Any, unit_id: int) -> HoldingReader:
+    """Return a holding register reader for a standalone pymodbus client."""
+
+    async def read(address: int, count: int) -> list[int] | None:
+        result = await client.read_holding_registers(
+            address=address, count=count, device_id=unit_id
+        )
+        if result.isError():
+            return None
+        return result.registers
+
+    return read
+
+
+async def detect_zones(read: HoldingReader) -> list[dict[str, Any]]:
     """Read zone_type and zone_function registers for all 12 zones.
 
+    read(address, count) returns the holding registers or None on error.
     Returns list of 12 dicts with keys: zone, zone_type, zone_function, active, label.
     """
     results: list[dict[str, Any]] = []
@@ -94,31 +122,21 @@ async def detect_zones(client: Any, unit_id: int) -> list[dict[str, Any]]:
         zone_function = 0
 
         try:
-            type_result = await client.read_holding_registers(
-                address=type_addr, count=1, device_id=unit_id
-            )
-            if type_result.isError():
+            type_result = await read(type_addr, 1)
+            if type_result is None:
                 _LOGGER.warning(
-                    "Zone %d: zone_type read error at addr %d: %s",
-                    zn,
-                    type_addr,
-                    type_result,
+                    "Zone %d: zone_type read error at addr %d", zn, type_addr
                 )
             else:
-                zone_type = type_result.registers[0]
+                zone_type = type_result[0]
 
-            func_result = await client.read_holding_registers(
-                address=func_addr, count=1, device_id=unit_id
-            )
-            if func_result.isError():
+            func_result = await read(func_addr, 1)
+            if func_result is None:
                 _LOGGER.warning(
-                    "Zone %d: zone_function read error at addr %d: %s",
-                    zn,
-                    func_addr,
-                    func_result,
+                    "Zone %d: zone_function read error at addr %d", zn, func_addr
                 )
             else:
-                zone_function = func_result.registers[0]
+                zone_function = func_result[0]
         except Exception:
             _LOGGER.exception("Zone %d: exception reading registers", zn)
 
@@ -195,13 +213,26 @@ class BroetjeOptionsFlow(OptionsFlow):
     async def async_step_general(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
-        """Manage scan interval options."""
+        """Manage scan interval, staleness, proxy and history options."""
         if user_input is not None:
             return self.async_create_entry(data=user_input)
 
         current_interval = self.config_entry.options.get(
             CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
         )
+        current_staleness = self.config_entry.options.get(
+            CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS
+        )
+        proxy_enabled = self.config_entry.options.get(CONF_PROXY_ENABLED, False)
+        proxy_port = self.config_entry.options.get(CONF_PROXY_PORT, DEFAULT_PROXY_PORT)
+        history_registers = self.config_entry.options.get(CONF_HISTORY_REGISTERS, [])
+        history_memory = self.config_entry.options.get(
+            CONF_HISTORY_MEMORY, DEFAULT_HISTORY_MEMORY
+        )
+        register_map = get_device_config(
+            self.config_entry.data.get(CONF_DEVICE_TYPE, DeviceType.ISR),
+            zones=self.config_entry.data.get("zones", [1]),
+        )["register_map"]
 
         return self.async_show_form(
             step_id="general",
@@ -210,6 +241,25 @@ class BroetjeOptionsFlow(OptionsFlow):
                     vol.Required(CONF_SCAN_INTERVAL, default=current_interval): vol.All(
                         int, vol.Range(min=10, max=3600)
                     ),
+                    vol.Required(
+                        CONF_MAX_STALENESS, default=current_staleness
+                    ): vol.All(int, vol.Range(min=0, max=86400)),
+                    vol.Required(CONF_PROXY_ENABLED, default=proxy_enabled): bool,
+                    vol.Required(CONF_PROXY_PORT, default=proxy_port): vol.All(
+                        int, vol.Range(min=1, max=65535)
+                    ),
+                    vol.Optional(
+                        CONF_HISTORY_REGISTERS, default=history_registers
+                    ): SelectSelector(
+                        SelectSelectorConfig(
+                            options=sorted(register_map),
+                            multiple=True,
+                            mode=SelectSelectorMode.DROPDOWN,
+                        )
+                    ),
+                    vol.Required(CONF_HISTORY_MEMORY, default=history_memory): vol.All(
+                        int, vol.Range(min=16, max=65536)
+                    ),
                 }
             ),
         )
@@ -230,8 +280,14 @@ class BroetjeOptionsFlow(OptionsFlow):
         if user_input is not None:
             return await self._async_save_zones(user_input)
 
+        # Read through the coordinator so detection shares its connection
+        # and lock (and coalesces with overlapping poll reads)
         coordinator = self.config_entry.runtime_data
-        zone_info = await detect_zones(coordinator._client, coordinator._unit_id)
+        zone_info = await detect_zones(
+            lambda address, count: coordinator.async_read_registers(
+                address, count, REG_HOLDING
+            )
+        )
 
         self._zone_options = [
             SelectOptionDict(value=str(z["zone"]), label=z["label"]) for z in zone_info
@@ -382,7 +438,9 @@ class BroetjeHeatpumpConfigFlow(ConfigFlow, domain=DOMAIN):
             connected = await client.connect()
             if not connected:
                 _LOGGER.error("Zone detection: failed to connect to Modbus device")
-            zone_info = await detect_zones(client, self._connection_data[CONF_UNIT_ID])
+            zone_info = await detect_zones(
+                client_holding_reader(client, self._connection_data[CONF_UNIT_ID])
+            )
         finally:
             client.close()
 
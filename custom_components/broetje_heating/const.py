@@ -8,10 +8,121 @@ DOMAIN: Final = "broetje_heating"
 DEFAULT_PORT: Final = 502
 DEFAULT_UNIT_ID: Final = 1
 DEFAULT_SCAN_INTERVAL: Final = 120
+DEFAULT_MAX_STALENESS: Final = 600
+
+# How often gating registers are re-read to open/close gated register groups
+GATE_RECHECK_INTERVAL: Final = 900
+
+# Gateways polled at the same time across all config entries; further polls
+# wait for a free slot. Polls of each entry are also spread over the scan
+# interval by a per-entry phase offset.
+MAX_CONCURRENT_POLLS: Final = 4
+
+# Modbus request priorities (lower is served first): user-triggered reads
+# jump ahead of queued background poll batches
+PRIORITY_INTERACTIVE: Final = 0
+PRIORITY_POLL: Final = 1
+
+# Per-batch read timeout, derived from the smoothed round-trip time (seconds).
+# Until a round trip has been measured the maximum applies.
+# Tuned per gateway (see tuning.py) and persisted between restarts.
+BATCH_TIMEOUT_RTT_FACTOR: Final = 4
+BATCH_TIMEOUT_MIN: Final = 1.5
+BATCH_TIMEOUT_MAX: Final = 10.0
+RTT_SMOOTHING: Final = 0.2  # weight of the newest sample in the average
+
+# Transport error rate (smoothed) at which each extra retry is allowed
+ERROR_RATE_SMOOTHING: Final = 0.1
+ERROR_RATE_RETRY_THRESHOLDS: Final = (0.05, 0.2)
+
+# Minimum gap between two requests (seconds). The GTW-08 needs some spacing;
+# the gap doubles on transport errors and halves after a run of clean
+# responses.
+REQUEST_GAP_DEFAULT: Final = 0.05
+REQUEST_GAP_STEP: Final = 0.025
+REQUEST_GAP_MAX: Final = 1.0
+REQUEST_GAP_RELAX_AFTER: Final = 50
+
+# Registers per read request. Modbus allows up to 125; batches start at 100
+# and the limit per gateway and register type is learned from probe reads.
+BATCH_SIZE_DEFAULT: Final = 100
+BATCH_SIZE_PROTOCOL_MAX: Final = 125
+# Unanswered probe reads of one size in a row before that size counts as
+# failed; a single lost response does not prove the size too large
+BATCH_PROBE_FAILURES: Final = 3
+# Seconds after which a failed batch size is probed again
+BATCH_SIZE_RETRY_AFTER: Final = 7 * 24 * 3600
+
+# Modbus exception code some devices return for too large a read quantity
+EXC_ILLEGAL_DATA_VALUE: Final = 0x03
+
+# Per-gateway storage of tuned transport parameters
+STORAGE_VERSION: Final = 1
+STORAGE_SAVE_DELAY: Final = 60
+
+# Consecutive batch timeouts after which the gateway is considered hung
+MAX_CONSECUTIVE_TIMEOUTS: Final = 2
+
+# Circuit breaker: after this many failed polls in a row, polls are skipped
+# for an exponentially growing backoff (seconds, capped) and resume only
+# after a single probe read succeeds
+BREAKER_FAILURE_THRESHOLD: Final = 3
+BREAKER_BACKOFF_MAX: Final = 3600
+
+# Modbus exception codes with their own retry policy
+EXC_ILLEGAL_DATA_ADDRESS: Final = 0x02  # never readable: excluded
+EXC_ACKNOWLEDGE: Final = 0x05  # busy: retried shortly
+EXC_DEVICE_BUSY: Final = 0x06  # busy: retried shortly
+EXC_GATEWAY_PATH: Final = 0x0A  # downstream bus problem: backoff
+EXC_GATEWAY_TARGET: Final = 0x0B  # downstream bus problem: backoff
+EXC_ILLEGAL_FUNCTION: Final = 0x01  # sent by the proxy for unsupported requests
+
+BUSY_RETRIES: Final = 3
+BUSY_RETRY_DELAY: Final = 0.2  # seconds, doubled on each retry
+GATEWAY_BACKOFF_MIN: Final = 30  # seconds, doubled per gateway error
+GATEWAY_BACKOFF_MAX: Final = 600
+
+# Fleet mode (fleet.py): updates waiting between worker processes and the
+# aggregator; a worker finding the channel full retries after the delay
+# while its streams skip or merge polls
+FLEET_QUEUE_SIZE: Final = 1000
+FLEET_QUEUE_RETRY: Final = 0.5  # seconds
+FLEET_STOP_TIMEOUT: Final = 10  # seconds for workers to close connections
+
+# Local Modbus TCP proxy (proxy.py): serves the registers of the last poll
+# and forwards other reads over the integration's gateway connection
+DEFAULT_PROXY_PORT: Final = 5020
+PROXY_BIND_HOST: Final = "0.0.0.0"
+PROXY_MAX_CLIENTS: Final = 16
+
+# In-memory history of raw register words (history.py), size in KiB
+DEFAULT_HISTORY_MEMORY: Final = 1024
+
+# Burst captures (burst.py): sampling interval and duration in seconds;
+# scheduled polls are suspended while a burst runs. Files are written to
+# this directory within the Home Assistant configuration directory.
+BURST_DEFAULT_INTERVAL: Final = 2
+BURST_MIN_INTERVAL: Final = 1
+BURST_MAX_INTERVAL: Final = 10
+BURST_DEFAULT_DURATION: Final = 300
+BURST_MAX_DURATION: Final = 1800
+CAPTURE_DIR: Final = "broetje_captures"
+
+# Capture files (capture.py): polls buffered before a block is appended
+CAPTURE_FLUSH_ROWS: Final = 60
+
+# Capture analytics (analytics.py): longer gaps between samples do not count
+# towards time spent in a state, in seconds
+ANALYTICS_MAX_GAP: Final = 900
 
 # Configuration keys
 CONF_UNIT_ID: Final = "unit_id"
 CONF_SCAN_INTERVAL: Final = "scan_interval"
+CONF_MAX_STALENESS: Final = "max_staleness"
+CONF_PROXY_ENABLED: Final = "proxy_enabled"
+CONF_PROXY_PORT: Final = "proxy_port"
+CONF_HISTORY_REGISTERS: Final = "history_registers"
+CONF_HISTORY_MEMORY: Final = "history_memory"
 
 # Manufacturer info
 MANUFACTURER: Final = "Brötje"
@@ -4,35 +4,62 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import timedelta
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Any
 
-from pymodbus.client import AsyncModbusTcpClient
-from pymodbus.exceptions import ModbusException
-
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PORT, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+from homeassistant.util.hass_dict import HassKey
 
+from .burst import BurstCapture
 from .const import (
+    CAPTURE_DIR,
+    CONF_HISTORY_MEMORY,
+    CONF_HISTORY_REGISTERS,
+    CONF_MAX_STALENESS,
+    CONF_PROXY_ENABLED,
+    CONF_PROXY_PORT,
     CONF_SCAN_INTERVAL,
     CONF_UNIT_ID,
+    DEFAULT_HISTORY_MEMORY,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_PROXY_PORT,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_UNIT_ID,
     DOMAIN,
     MANUFACTURER,
-    REG_HOLDING,
-    REG_INPUT,
+    MAX_CONCURRENT_POLLS,
+    PRIORITY_INTERACTIVE,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
 )
-from .devices import CONF_DEVICE_TYPE, DEVICE_MODELS, DeviceType, get_device_config
+from .devices import CONF_DEVICE_TYPE, DEVICE_MODELS, DeviceType
+from .engine import BroetjeEngine, EngineError
+from .history import RegisterHistory
+from .proxy import ModbusProxy
+from .scheduler import delay_to_phase, poll_phase
 
 _LOGGER = logging.getLogger(__name__)
 
+# Shared by the coordinators of all config entries
+POLL_SLOTS: HassKey[asyncio.Semaphore] = HassKey(f"{DOMAIN}_poll_slots")
+
+
+class BroetjeModbusCoordinator(DataUpdateCoordinator[list[Any]]):
+    """Coordinator for fetching data from Brötje Heatpump via Modbus.
 
-class BroetjeModbusCoordinator(DataUpdateCoordinator[dict[str, Any]]):
-    """Coordinator for fetching data from Brötje Heatpump via Modbus."""
+    Polling, decoding and the slot store live in BroetjeEngine; this class
+    adapts it to Home Assistant (entity registry, config entry, storage).
+    """
 
     config_entry: ConfigEntry
 
@@ -46,18 +73,33 @@ class BroetjeModbusCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             config_entry=entry,
             update_interval=timedelta(seconds=scan_interval),
         )
-        self._host = entry.data[CONF_HOST]
-        self._port = entry.data[CONF_PORT]
-        self._unit_id = entry.data.get(CONF_UNIT_ID, DEFAULT_UNIT_ID)
-        self._client: AsyncModbusTcpClient | None = None
-        self._lock = asyncio.Lock()
+        host = entry.data[CONF_HOST]
+        port = entry.data[CONF_PORT]
+
+        # Polls run at this entry's phase of the scan interval, so entries
+        # with the same interval do not all poll at once
+        self._scan_interval: float = scan_interval
+        self._poll_phase = poll_phase(entry.entry_id, scan_interval)
+        self._poll_slots = hass.data.setdefault(
+            POLL_SLOTS, asyncio.Semaphore(MAX_CONCURRENT_POLLS)
+        )
 
         # Load device-specific configuration
         device_type_str = entry.data.get(CONF_DEVICE_TYPE, DeviceType.ISR.value)
         self._device_type = DeviceType(device_type_str)
-        zones = entry.data.get("zones", [1])
-        device_config = get_device_config(self._device_type, zones=zones)
-        self.register_map: dict[str, Any] = device_config["register_map"]
+        self.engine = BroetjeEngine(
+            host,
+            port,
+            self._device_type,
+            zones=entry.data.get("zones", [1]),
+            unit_id=entry.data.get(CONF_UNIT_ID, DEFAULT_UNIT_ID),
+            poll_interval=scan_interval,
+            max_staleness=entry.options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS),
+        )
+        device_config = self.engine.device_config
+        self.register_map: dict[str, Any] = self.engine.register_map
+        self.bit_registers: dict[str, dict[str, Any]] = self.engine.bit_registers
+        self.register_slots: dict[str, int] = self.engine.register_slots
         self.sensors: dict[str, Any] = device_config["sensors"]
         self.binary_sensors: dict[str, Any] = device_config["binary_sensors"]
         self.enum_maps: dict[str, dict[int, str]] = device_config["enum_maps"]
@@ -65,6 +107,31 @@ class BroetjeModbusCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             device_config.get("entity_classification", {})
         )
 
+        # What the engine learned about the gateway (transport tuning, batch
+        # sizes), persisted so a restart does not begin from the defaults
+        self._gateway_store: Store[dict[str, Any]] = Store(
+            hass,
+            STORAGE_VERSION,
+            f"{DOMAIN}.gateway_{slugify(f'{host}_{port}')}",
+        )
+
+        # Every entity is written on the first update and after a failure
+        self._notify_all = True
+
+        # Fires when the oldest value exceeds the staleness limit, so
+        # entities turn unavailable even while no update succeeds
+        self._unsub_expiry: CALLBACK_TYPE | None = None
+
+        # Optional local Modbus TCP server for other clients of the gateway
+        self._proxy: ModbusProxy | None = None
+
+        # Optional in-memory history of raw words of selected registers
+        self.history: RegisterHistory | None = None
+        self.update_history()
+
+        # Running burst capture; scheduled polls are suspended meanwhile
+        self.burst: BurstCapture | None = None
+
         # Device info
         self.device_serial: str | None = None
         self.device_model: str = DEVICE_MODELS.get(self._device_type, "Heatpump")
@@ -73,35 +140,132 @@ class BroetjeModbusCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
     def update_scan_interval(self, scan_interval: int) -> None:
         """Update the polling interval (called when options change)."""
-        self.update_interval = timedelta(seconds=scan_interval)
+        self._scan_interval = scan_interval
+        self._poll_phase = poll_phase(self.config_entry.entry_id, scan_interval)
+        self._align_next_poll()
+        self.engine.poll_interval = scan_interval
         _LOGGER.info("Scan interval updated to %d seconds", scan_interval)
 
-    async def _async_setup(self) -> None:
-        """Set up the coordinator (called during first refresh)."""
-        await self._connect()
-        await self._read_device_info()
+    def update_max_staleness(self, max_staleness: int) -> None:
+        """Update how long cached values outlive failed reads."""
+        self.engine.max_staleness = max_staleness
+        self._schedule_expiry()
+        _LOGGER.info("Maximum staleness updated to %d seconds", max_staleness)
+
+    def update_history(self) -> None:
+        """Create or resize the register history to match the options.
 
-    async def _connect(self) -> None:
-        """Establish connection to the Modbus device."""
-        if self._client is not None and self._client.connected:
+        Changing the selection or memory budget discards the samples held.
+        """
+        options = self.config_entry.options
+        registers = [
+            key
+            for key in options.get(CONF_HISTORY_REGISTERS, [])
+            if key in self.register_map
+        ]
+        budget = options.get(CONF_HISTORY_MEMORY, DEFAULT_HISTORY_MEMORY) * 1024
+        if not registers:
+            self.history = None
+            return
+        if (
+            self.history is not None
+            and self.history.registers == registers
+            and self.history.budget == budget
+        ):
+            return
+        self.history = RegisterHistory(self.register_map, registers, budget)
+        _LOGGER.debug(
+            "Register history: %d registers, %d samples (%d bytes)",
+            len(registers),
+            self.history.capacity,
+            self.history.memory,
+        )
+
+    async def async_update_proxy(self) -> None:
+        """Start, restart or stop the Modbus proxy to match the options."""
+        options = self.config_entry.options
+        enabled = options.get(CONF_PROXY_ENABLED, False)
+        port = options.get(CONF_PROXY_PORT, DEFAULT_PROXY_PORT)
+        if self._proxy is not None:
+            if enabled and self._proxy.port == port:
+                return
+            await self._proxy.stop()
+            self._proxy = None
+        if not enabled:
+            return
+
+        proxy = ModbusProxy(self.engine, port)
+        try:
+            await proxy.start()
+        except OSError as err:
+            _LOGGER.error("Cannot start the Modbus proxy on port %d: %s", port, err)
             return
+        self._proxy = proxy
+
+    def async_start_burst(
+        self, registers: list[str], interval: float, duration: float
+    ) -> Path:
+        """Start a burst capture and return the file it will be written to.
 
-        self._client = AsyncModbusTcpClient(
-            host=self._host,
-            port=self._port,
+        The file is written when the burst ends; a full poll follows, as
+        entities were not updated during the burst.
+        """
+        capture = BurstCapture(
+            self.engine, registers, interval=interval, duration=duration
+        )
+        path = Path(
+            self.hass.config.path(
+                CAPTURE_DIR,
+                f"burst_{slugify(self.config_entry.title)}_"
+                f"{dt_util.now().strftime('%Y%m%d_%H%M%S')}.brcap",
+            )
+        )
+        self.burst = capture
+        self._unschedule_refresh()
+        self._align_next_poll()
+        self._schedule_expiry()
+        self.config_entry.async_create_background_task(
+            self.hass, self._async_run_burst(capture, path), "broetje_heating burst"
         )
+        _LOGGER.info(
+            "Burst capture of %s every %s s for %s s started",
+            ", ".join(registers),
+            interval,
+            duration,
+        )
+        return path
 
-        if not await self._client.connect():
-            raise UpdateFailed(f"Failed to connect to {self._host}:{self._port}")
+    async def _async_run_burst(self, capture: BurstCapture, path: Path) -> None:
+        """Run a burst capture, write its file and resume scheduled polls.
 
-        _LOGGER.debug("Connected to Modbus device at %s:%s", self._host, self._port)
+        A burst cancelled by unloading the entry is discarded.
+        """
+        try:
+            await capture.run()
+        finally:
+            self.burst = None
+        try:
+            await self.hass.async_add_executor_job(capture.write, path)
+        except OSError as err:
+            _LOGGER.error("Cannot write burst capture to %s: %s", path, err)
+        else:
+            _LOGGER.info(
+                "Burst capture wrote %d samples (%d skipped) to %s",
+                len(capture.samples),
+                capture.skipped,
+                path,
+            )
+        await self.async_request_refresh()
 
-    async def _disconnect(self) -> None:
-        """Disconnect from the Modbus device."""
-        if self._client is not None:
-            self._client.close()
-            self._client = None
-            _LOGGER.debug("Disconnected from Modbus device")
+    async def _async_setup(self) -> None:
+        """Set up the coordinator (called during first refresh)."""
+        if stored := await self._gateway_store.async_load():
+            self.engine.restore_profile(stored)
+        try:
+            await self.engine.setup()
+        except EngineError as err:
+            raise UpdateFailed(str(err)) from err
+        await self._read_device_info()
 
     async def _read_device_info(self) -> None:
         """Read device identification information."""
@@ -109,53 +273,74 @@ class BroetjeModbusCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         # This will be populated once we have the register addresses from the PDF
         pass
 
-    async def _read_registers(
+    def get_value(self, register_key: str) -> Any:
+        """Return the current value of a register or bitfield bit."""
+        return self.engine.get_value(register_key)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a dict copy of all register values (for diagnostics/tools)."""
+        return self.engine.snapshot()
+
+    def slot_changed(self, slot: int) -> bool:
+        """Return whether the last update changed the value in a slot.
+
+        Every slot counts as changed while updates fail and on the first
+        update after a failure, so availability changes are always written.
+        """
+        return (
+            self._notify_all
+            or not self.last_update_success
+            or slot in self.engine.changed_slots
+        )
+
+    def value_is_fresh(self, slot: int) -> bool:
+        """Return whether a slot holds a value within the staleness limit."""
+        return self.engine.value_is_fresh(slot)
+
+    def last_successful_read(self, slot: int) -> datetime | None:
+        """Return when a slot was last read, if it now shows a cached value."""
+        read_at = self.engine.read_at[slot]
+        if read_at is None or self.engine.slots[slot] is None:
+            return None
+        if slot in self.engine.stale_slots or not self.last_update_success:
+            return dt_util.utc_from_timestamp(read_at)
+        return None
+
+    def get_register_config(self, register_key: str) -> dict[str, Any] | None:
+        """Return the register config for a register or named bitfield bit."""
+        return self.engine.get_register_config(register_key)
+
+    def register_applies(self, register_key: str) -> bool:
+        """Return whether a register applies to its zone's detected type."""
+        return self.engine.register_applies(register_key)
+
+    async def async_read_registers(
         self,
         address: int,
         count: int,
         register_type: str,
     ) -> list[int] | None:
-        """Read registers from the Modbus device."""
-        async with self._lock:
-            try:
-                await self._connect()
-
-                if register_type == REG_INPUT:
-                    result = await self._client.read_input_registers(
-                        address=address, count=count, device_id=self._unit_id
-                    )
-                elif register_type == REG_HOLDING:
-                    result = await self._client.read_holding_registers(
-                        address=address, count=count, device_id=self._unit_id
-                    )
-                else:
-                    _LOGGER.error("Unknown register type: %s", register_type)
-                    return None
-
-                if result.isError():
-                    _LOGGER.warning(
-                        "Modbus error reading address %s: %s",
-                        address,
-                        result,
-                    )
-                    return None
-
-                return list(result.registers)
-
-            except ModbusException as err:
-                _LOGGER.error("Modbus exception: %s", err)
-                await self._disconnect()
-                return None
+        """Read registers through the coordinator's connection.
+
+        For callers outside the poll loop (e.g. zone detection in the options
+        flow), so they share the lock and coalescing of the polling reads.
+        The read is interactive: it is served ahead of queued poll batches.
+        """
+        return await self.engine.read_registers(
+            address, count, register_type, PRIORITY_INTERACTIVE
+        )
 
     def _get_needed_registers(self) -> set[str]:
         """Get the set of register keys needed by enabled entities.
 
         This checks the entity registry to determine which entities are enabled.
         If an entity is not yet in the registry (first refresh), it's assumed needed.
-        Only entities explicitly disabled by the user are skipped.
+        Only entities explicitly disabled by the user are skipped, as well as
+        zone registers that do not apply to the zone's detected type/function.
         """
         entity_registry = er.async_get(self.hass)
         device_id = self.config_entry.unique_id or self.config_entry.entry_id
+        poll_key = self.engine.poll_key
 
         needed_registers: set[str] = set()
 
@@ -168,13 +353,13 @@ class BroetjeModbusCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
             # If entity doesn't exist in registry yet, assume we need it
             if entity_id is None:
-                needed_registers.add(sensor_config["register"])
+                needed_registers.add(poll_key(sensor_config["register"]))
                 continue
 
             entry = entity_registry.async_get(entity_id)
             # If entity exists and is NOT disabled, we need this register
             if entry and not entry.disabled:
-                needed_registers.add(sensor_config["register"])
+                needed_registers.add(poll_key(sensor_config["register"]))
 
         # Check binary sensors
         for sensor_key, sensor_config in self.binary_sensors.items():
@@ -185,233 +370,99 @@ class BroetjeModbusCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
             # If entity doesn't exist in registry yet, assume we need it
             if entity_id is None:
-                needed_registers.add(sensor_config["register"])
+                needed_registers.add(poll_key(sensor_config["register"]))
                 continue
 
             entry = entity_registry.async_get(entity_id)
             # If entity exists and is NOT disabled, we need this register
             if entry and not entry.disabled:
-                needed_registers.add(sensor_config["register"])
+                needed_registers.add(poll_key(sensor_config["register"]))
 
-        return needed_registers
+        return {key for key in needed_registers if self.register_applies(key)}
 
-    def _group_registers_for_batch_read(
-        self, register_keys: set[str]
-    ) -> list[dict[str, Any]]:
-        """Group registers into batches for efficient reading.
+    async def async_refresh_register(self, register_key: str) -> None:
+        """Read a single register and merge it into the current data.
 
-        Groups consecutive or near-consecutive registers to minimize
-        the number of Modbus read operations. Reading a few unused
-        registers between needed ones is much cheaper than making
-        separate Modbus requests.
+        Used for entity-initiated refreshes (homeassistant.update_entity) so
+        that polling one value does not trigger a full poll of every register.
         """
-        if not register_keys:
-            return []
-
-        # Modbus limits: max 125 registers per read, we use 100 for safety
-        MAX_BATCH_SIZE = 100
-        # Max gap between registers to still batch them together.
-        # Must be 0 (truly consecutive only) because the Brötje device has gaps
-        # in its register map (e.g., 24594 exists, 24595 doesn't, 24596 exists).
-        # Reading non-existent addresses causes batch read failures.
-        # Note: With the formula (addr <= end + MAX_GAP + 1), MAX_GAP=0 means
-        # only consecutive addresses (gap of 1) are batched.
-        MAX_GAP = 0
-
-        # Build list of register info and sort by type, then address
-        registers: list[dict[str, Any]] = []
-        for key in register_keys:
-            config = self.register_map[key]
-            registers.append(
-                {
-                    "key": key,
-                    "address": config["address"],
-                    "count": config.get("count", 1),
-                    "type": config["type"],
-                    "config": config,
-                }
-            )
-
-        # Sort by register type first (to group holding/input), then by address
-        registers.sort(key=lambda x: (x["type"], x["address"]))
-
-        # Group into batches
-        batches: list[dict[str, Any]] = []
-        current_batch: dict[str, Any] | None = None
-
-        for reg in registers:
-            reg_end = reg["address"] + reg["count"] - 1
-
-            if current_batch is None:
-                # Start new batch
-                current_batch = {
-                    "type": reg["type"],
-                    "start_address": reg["address"],
-                    "end_address": reg_end,
-                    "registers": [reg],
-                }
-            elif (
-                reg["type"] == current_batch["type"]
-                and reg["address"] <= current_batch["end_address"] + MAX_GAP + 1
-                and (reg_end - current_batch["start_address"] + 1) <= MAX_BATCH_SIZE
-            ):
-                # Add to current batch
-                current_batch["registers"].append(reg)
-                current_batch["end_address"] = max(
-                    current_batch["end_address"], reg_end
-                )
-            else:
-                # Finish current batch and start new one
-                batches.append(current_batch)
-                current_batch = {
-                    "type": reg["type"],
-                    "start_address": reg["address"],
-                    "end_address": reg_end,
-                    "registers": [reg],
-                }
-
-        if current_batch:
-            batches.append(current_batch)
-
-        return batches
-
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from the Modbus device."""
-        data: dict[str, Any] = {}
-
-        # Get only the registers needed by enabled entities
-        needed_registers = self._get_needed_registers()
-
-        if not needed_registers:
-            _LOGGER.debug("No enabled entities, skipping Modbus read")
-            return data
-
-        # Group registers into batches for efficient reading
-        batches = self._group_registers_for_batch_read(needed_registers)
-
-        _LOGGER.debug(
-            "Reading %d registers in %d batch(es) for enabled entities",
-            len(needed_registers),
-            len(batches),
+        # Notify other entities sharing the register (e.g. bitfield bits)
+        if await self.engine.refresh_register(register_key):
+            self.async_update_listeners()
+
+    def _align_next_poll(self) -> None:
+        """Schedule the next poll at this entry's phase of the interval."""
+        if self.burst is not None:
+            # No scheduled polls until the burst is over
+            self.update_interval = None
+            return
+        delay = delay_to_phase(
+            self.hass.loop.time(), self._scan_interval, self._poll_phase
+        )
+        self.update_interval = timedelta(seconds=delay)
+
+    def _schedule_expiry(self) -> None:
+        """Schedule expiring values at the earliest staleness deadline."""
+        if self._unsub_expiry is not None:
+            self._unsub_expiry()
+            self._unsub_expiry = None
+        if self.burst is not None:
+            # Values are kept while a burst suspends polls; the poll that
+            # follows it schedules expiry again
+            return
+        if (expiry := self.engine.next_expiry()) is None:
+            return
+        # A second late: a value exactly at the limit still counts as fresh
+        self._unsub_expiry = async_call_later(
+            self.hass, max(expiry - time.time(), 0) + 1, self._async_expire_values
         )
 
-        # Disconnect before starting to clear any stale data in the buffer
-        # This prevents transaction ID mismatch errors from leftover responses
-        await self._disconnect()
+    @callback
+    def _async_expire_values(self, _now: datetime) -> None:
+        """Clear values past the staleness limit and write affected entities."""
+        self._unsub_expiry = None
+        if self.engine.expire_values():
+            self.async_update_listeners()
+        self._schedule_expiry()
+
+    async def _async_update_data(self) -> list[Any]:
+        """Poll the registers of enabled entities through the engine."""
+        # After a failed update every entity must be written again, even if
+        # its value is unchanged, so it becomes available
+        self._notify_all = not self.last_update_success
+
+        needed = self._get_needed_registers()
+        if self.history is not None:
+            # Recorded registers are polled even without enabled entities
+            needed |= {
+                key for key in self.history.registers if self.register_applies(key)
+            }
 
         try:
-            async with asyncio.timeout(30):
-                for batch in batches:
-                    start_addr = batch["start_address"]
-                    count = batch["end_address"] - start_addr + 1
-
-                    _LOGGER.debug(
-                        "Batch read: type=%s, address=%d, count=%d (%d registers)",
-                        batch["type"],
-                        start_addr,
-                        count,
-                        len(batch["registers"]),
-                    )
-
-                    result = await self._read_registers(
-                        start_addr, count, batch["type"]
-                    )
-
-                    if result is not None:
-                        # Extract individual register values from batch response
-                        for reg in batch["registers"]:
-                            offset = reg["address"] - start_addr
-                            reg_count = reg["count"]
-                            reg_values = result[offset : offset + reg_count]
-
-                            if len(reg_values) == reg_count:
-                                data[reg["key"]] = self._process_register_value(
-                                    reg_values, reg["config"]
-                                )
-                            else:
-                                _LOGGER.warning(
-                                    "Incomplete data for register %s at address %d",
-                                    reg["key"],
-                                    reg["address"],
-                                )
-                                data[reg["key"]] = None
-                    else:
-                        # Batch read failed, mark all registers in batch as None
-                        for reg in batch["registers"]:
-                            data[reg["key"]] = None
-
-        except TimeoutError as err:
-            raise UpdateFailed("Timeout communicating with device") from err
-        except ModbusException as err:
-            raise UpdateFailed(f"Modbus error: {err}") from err
+            # Caps how many gateways are polled at once across all entries
+            async with self._poll_slots:
+                data = await self.engine.poll(needed)
+        except EngineError as err:
+            raise UpdateFailed(str(err)) from err
+        finally:
+            # Read by the coordinator when it schedules the next refresh
+            self._align_next_poll()
+            self._schedule_expiry()
+            self._gateway_store.async_delay_save(
+                self.engine.profile, STORAGE_SAVE_DELAY
+            )
 
+        if self.history is not None:
+            self.history.record(time.time(), self.engine.cached_registers)
         return data
 
-    # Standard Modbus sentinel values indicating "not available" / "no data".
-    # These are checked against the raw decoded value BEFORE scaling.
-    _SENTINEL_VALUES: dict[str, set[int]] = {
-        "int16": {-1},  # 0xFFFF signed
-        "uint16": {0xFFFF},  # 65535
-        "int32": {-1},  # 0xFFFFFFFF signed
-        "uint32": {0xFFFFFFFF},  # 4294967295
-    }
-
-    def _process_register_value(
-        self,
-        registers: list[int],
-        config: dict[str, Any],
-    ) -> Any:
-        """Process raw register values based on configuration."""
-        data_type = config.get("data_type", "int16")
-        scale = config.get("scale", 1.0)
-        bit = config.get("bit")
-
-        if data_type == "bool":
-            value = registers[0]
-            if bit is not None:
-                return bool(value & (1 << bit))
-            return bool(value)
-
-        if data_type == "int16":
-            value = registers[0]
-            # Convert to signed if necessary
-            if value >= 32768:
-                value -= 65536
-            if value in self._SENTINEL_VALUES.get("int16", ()):
-                return None
-            return value * scale
-
-        if data_type == "uint16":
-            value = registers[0]
-            if value in self._SENTINEL_VALUES.get("uint16", ()):
-                return None
-            return value * scale
-
-        if data_type == "int32":
-            value = (registers[0] << 16) | registers[1]
-            if value >= 2147483648:
-                value -= 4294967296
-            if value in self._SENTINEL_VALUES.get("int32", ()):
-                return None
-            return value * scale
-
-        if data_type == "uint32":
-            value = (registers[0] << 16) | registers[1]
-            if value in self._SENTINEL_VALUES.get("uint32", ()):
-                return None
-            return value * scale
-
-        if data_type == "string":
-            # Decode registers as ASCII string
-            chars = []
-            for reg in registers:
-                chars.append(chr((reg >> 8) & 0xFF))
-                chars.append(chr(reg & 0xFF))
-            return "".join(chars).rstrip("\x00").strip()
-
-        return registers[0] * scale
-
     async def async_shutdown(self) -> None:
         """Shutdown the coordinator."""
-        await self._disconnect()
+        if self._unsub_expiry is not None:
+            self._unsub_expiry()
+            self._unsub_expiry = None
+        if self._proxy is not None:
+            await self._proxy.stop()
+            self._proxy = None
+        await self.engine.close()
         await super().async_shutdown()
@@ -21,6 +21,45 @@ DEVICE_MODELS: Final[dict[DeviceType, str]] = {
 }
 
 
+# Register gates: a register definition may carry
+#   "gate": {"register": <key>, "closed": frozenset({...})}
+# meaning the register is only polled while the last value read from the
+# gating register is not in "closed". None in "closed" matches a missing
+# value (sentinel), which allows a register to gate itself (feature absent).
+
+
+def expand_bitfields(register_map: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Return a bool register config for every named bit of a bitfield word.
+
+    Bitfield words ("data_type": "bitfield") are polled once as a whole; each
+    named bit resolves back to its word through the "bitfield" key.
+    """
+    bit_registers: dict[str, dict[str, Any]] = {}
+    for word_key, config in register_map.items():
+        if config.get("data_type") != "bitfield":
+            continue
+        word_config = {k: v for k, v in config.items() if k != "bits"}
+        for bit_key, bit in config["bits"].items():
+            bit_registers[bit_key] = {
+                **word_config,
+                "data_type": "bool",
+                "bit": bit,
+                "bitfield": word_key,
+            }
+    return bit_registers
+
+
+def gate_is_open(gate: dict[str, Any] | None, gate_values: dict[str, Any]) -> bool:
+    """Return whether a register gate is open given known gating values.
+
+    Gates whose gating register has not been read yet are open, so nothing is
+    skipped before the first gate check.
+    """
+    if gate is None or gate["register"] not in gate_values:
+        return True
+    return gate_values[gate["register"]] not in gate["closed"]
+
+
 def get_device_config(
     device_type: DeviceType | str, zones: list[int] | None = None
 ) -> dict[str, Any]:
@@ -378,6 +378,10 @@ ISR_ENUM_MAPS: Final = {
     "status_codes": ISR_STATUS_CODES,
 }
 
+# Buffer storage registers only matter with a buffer installed; without one,
+# buffer temperature B4 reads as "not available" (see gate_is_open).
+_GATE_BUFFER_PRESENT: Final = {"register": "buffer_temp_1", "closed": frozenset({None})}
+
 # ===== Modbus Register Map =====
 
 # Modbus register map from Brötje documentation
@@ -809,6 +813,7 @@ ISR_REGISTER_MAP: Final = {
         "count": 1,
         "data_type": "uint16",
         "scale": SCALE_TEMP,
+        "gate": _GATE_BUFFER_PRESENT,
     },
     # Buffer temperature 2 (B41) - Register 17412 (read-only)
     "buffer_temp_2": {
@@ -817,6 +822,7 @@ ISR_REGISTER_MAP: Final = {
         "count": 1,
         "data_type": "uint16",
         "scale": SCALE_TEMP,
+        "gate": _GATE_BUFFER_PRESENT,
     },
     # Generator blocking valve Y4 state - Register 17458 (read-only)
     "buffer_generator_valve": {
@@ -825,6 +831,7 @@ ISR_REGISTER_MAP: Final = {
         "count": 1,
         "data_type": "uint16",
         "scale": 1,
+        "gate": _GATE_BUFFER_PRESENT,
     },
     # Buffer temperature 3 (B42) - Register 17463 (read-only)
     "buffer_temp_3": {
@@ -833,6 +840,7 @@ ISR_REGISTER_MAP: Final = {
         "count": 1,
         "data_type": "uint16",
         "scale": SCALE_TEMP,
+        "gate": _GATE_BUFFER_PRESENT,
     },
     # Buffer status - Register 17465 (read-only)
     "buffer_status": {
@@ -841,6 +849,7 @@ ISR_REGISTER_MAP: Final = {
         "count": 1,
         "data_type": "uint16",
         "scale": 1,
+        "gate": _GATE_BUFFER_PRESENT,
     },
     # Buffer setpoint - Register 17466 (read-only)
     "buffer_setpoint": {
@@ -849,6 +858,7 @@ ISR_REGISTER_MAP: Final = {
         "count": 1,
         "data_type": "uint16",
         "scale": SCALE_TEMP,
+        "gate": _GATE_BUFFER_PRESENT,
     },
     # Buffer return valve Y15 state - Register 17468 (read-only)
     "buffer_return_valve": {
@@ -857,6 +867,7 @@ ISR_REGISTER_MAP: Final = {
         "count": 1,
         "data_type": "uint16",
         "scale": 1,
+        "gate": _GATE_BUFFER_PRESENT,
     },
     # ===== KESSEL (Boiler) =====
     # Manual setpoint - Register 24576
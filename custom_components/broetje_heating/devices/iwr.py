@@ -540,6 +540,102 @@ ZONE_ADDRESSES: Final = {
     "CP21X": [675, 1187, 1699, 2211, 2723, 3235, 3747, 4259, 4771, 5283, 5795, 6307],
 }
 
+# ===== Zone Register Applicability =====
+# Most zone registers only make sense for some zone types (register 640+512n,
+# IWR_ZONE_TYPE) or zone functions (register 641+512n, IWR_ZONE_FUNCTION).
+# Keyed by register suffix (the part after "zone{n}_"); suffixes not listed
+# apply to every zone. Rules are attached to the generated register entries
+# as "applies_to" and evaluated by zone_register_applies().
+
+_ZONE_TYPES_ROOM: Final = frozenset({1, 2})  # CH only, CH + cooling
+_ZONE_TYPES_COOLING: Final = frozenset({2})
+_ZONE_TYPES_DHW: Final = frozenset({3})
+_ZONE_TYPES_PROCESS_HEAT: Final = frozenset({4})
+_ZONE_TYPES_SWIMMING_POOL: Final = frozenset({5})
+_ZONE_FUNCTIONS_MIXING: Final = frozenset({2})
+
+# Zone types with unknown register layout: never prune anything for these.
+_ZONE_TYPES_UNCLASSIFIED: Final = frozenset({254, 255})
+
+ZONE_REGISTER_APPLICABILITY: Final[dict[str, dict[str, frozenset[int]]]] = {
+    # Room heating (CH zones)
+    "room_setpoint": {"zone_type": _ZONE_TYPES_ROOM},
+    "room_setpoint_manual": {"zone_type": _ZONE_TYPES_ROOM},
+    "room_temp": {"zone_type": _ZONE_TYPES_ROOM},
+    "room_temp_measured": {"zone_type": _ZONE_TYPES_ROOM},
+    **{f"comfort_setpoint_{sp}": {"zone_type": _ZONE_TYPES_ROOM} for sp in range(1, 6)},
+    "night_setback": {"zone_type": _ZONE_TYPES_ROOM},
+    "holiday_setpoint": {"zone_type": _ZONE_TYPES_ROOM},
+    "temporary_setpoint": {"zone_type": _ZONE_TYPES_ROOM},
+    "heating_control_strategy": {"zone_type": _ZONE_TYPES_ROOM},
+    "heating_curve_gradient": {"zone_type": _ZONE_TYPES_ROOM},
+    "heating_curve_footpoint": {"zone_type": _ZONE_TYPES_ROOM},
+    "heating_curve_footpoint_night": {"zone_type": _ZONE_TYPES_ROOM},
+    "max_preheat_time": {"zone_type": _ZONE_TYPES_ROOM},
+    # Cooling (CH + cooling zones)
+    **{
+        f"cooling_room_setpoint_{sp}": {"zone_type": _ZONE_TYPES_COOLING}
+        for sp in range(1, 6)
+    },
+    "cooling_night_setback": {"zone_type": _ZONE_TYPES_COOLING},
+    "cooling_mixing_setpoint": {"zone_type": _ZONE_TYPES_COOLING},
+    # Domestic hot water
+    "dhw_comfort_setpoint": {"zone_type": _ZONE_TYPES_DHW},
+    "dhw_reduced_setpoint": {"zone_type": _ZONE_TYPES_DHW},
+    "dhw_holiday_setpoint": {"zone_type": _ZONE_TYPES_DHW},
+    "dhw_antilegionella_setpoint": {"zone_type": _ZONE_TYPES_DHW},
+    "dhw_hysteresis": {"zone_type": _ZONE_TYPES_DHW},
+    "dhw_calorifier_offset": {"zone_type": _ZONE_TYPES_DHW},
+    "dhw_calorifier_raise": {"zone_type": _ZONE_TYPES_DHW},
+    "dhw_calorifier_hysteresis": {"zone_type": _ZONE_TYPES_DHW},
+    # Process heat
+    "process_heat_setpoint": {"zone_type": _ZONE_TYPES_PROCESS_HEAT},
+    "process_heat_hysteresis": {"zone_type": _ZONE_TYPES_PROCESS_HEAT},
+    "process_heat_offset": {"zone_type": _ZONE_TYPES_PROCESS_HEAT},
+    "process_heat_calorifier_raise": {"zone_type": _ZONE_TYPES_PROCESS_HEAT},
+    # Swimming pool
+    "swimming_pool_setpoint": {"zone_type": _ZONE_TYPES_SWIMMING_POOL},
+    "swimming_pool_pump": {"zone_type": _ZONE_TYPES_SWIMMING_POOL},
+    # Mixing valve (mixing circuit function only)
+    "mixing_valve_shift": {"zone_function": _ZONE_FUNCTIONS_MIXING},
+    "mixing_valve_bandwidth": {"zone_function": _ZONE_FUNCTIONS_MIXING},
+    "mixing_valve_opening": {"zone_function": _ZONE_FUNCTIONS_MIXING},
+}
+
+
+def zone_register_applies(
+    rule: dict[str, frozenset[int]] | None,
+    zone_type: int | None,
+    zone_function: int | None,
+) -> bool:
+    """Return whether a zone register rule applies to a zone's type/function.
+
+    Unknown values (not read yet, or unclassified types like "other") never
+    prune anything, so a failed detection read falls back to polling everything.
+    """
+    if not rule or zone_type is None or zone_type in _ZONE_TYPES_UNCLASSIFIED:
+        return True
+    if (types := rule.get("zone_type")) is not None and zone_type not in types:
+        return False
+    functions = rule.get("zone_function")
+    return functions is None or zone_function is None or zone_function in functions
+
+
+# ===== Register Gates =====
+# Feature-dependent register groups are only polled while their gate is open
+# (see gate_is_open in devices/__init__.py). Gating registers are re-checked on
+# a slow cadence by the coordinator.
+
+# Cooling setpoints only matter while cooling is enabled (register 502)
+_GATE_COOLING_ENABLED: Final = {"register": "cooling_enabled", "closed": frozenset({0})}
+# Per-board error details only matter while an error is present (register 531)
+_GATE_ERROR_PRESENT: Final = {"register": "error_present", "closed": frozenset({0})}
+# Cascade temperatures (Tab.23) read as "not available" without a cascade
+_GATE_CASCADE_PRESENT: Final = {
+    "register": "cascade_flow_temperature",
+    "closed": frozenset({None}),
+}
+
 # ===== Static Register Map (non-zone registers) =====
 
 _IWR_STATIC_REGISTER_MAP: Final = {
@@ -767,6 +863,7 @@ _IWR_STATIC_REGISTER_MAP: Final = {
         "count": 1,
         "data_type": "uint16",
         "scale": IWR_SCALE_TEMP,
+        "gate": _GATE_COOLING_ENABLED,
     },
     "dhw_flow_setpoint": {
         "address": 408,
@@ -994,6 +1091,7 @@ _IWR_STATIC_REGISTER_MAP: Final = {
         "count": 1,
         "data_type": "int16",
         "scale": IWR_SCALE_TEMP,
+        "gate": _GATE_CASCADE_PRESENT,
     },
     "cascade_return_temperature": {
         "address": 7163,
@@ -1001,164 +1099,59 @@ _IWR_STATIC_REGISTER_MAP: Final = {
         "count": 1,
         "data_type": "int16",
         "scale": IWR_SCALE_TEMP,
+        "gate": _GATE_CASCADE_PRESENT,
     },
     # --- Bitfield registers (Tab.13-15) ---
+    # Each word is read and decoded once; "bits" fans it out into named bool
+    # values (see expand_bitfields in devices/__init__.py).
     # Register 275 bits (Tab.13 - Heat demand bitfield)
-    "demand_direct_zones": {
+    "demand_bitfield": {
         "address": 275,
         "type": REG_HOLDING,
         "count": 1,
-        "data_type": "bool",
-        "bit": 0,
-    },
-    "demand_mixing_circuits": {
-        "address": 275,
-        "type": REG_HOLDING,
-        "count": 1,
-        "data_type": "bool",
-        "bit": 1,
-    },
-    "demand_valves_open_safety": {
-        "address": 275,
-        "type": REG_HOLDING,
-        "count": 1,
-        "data_type": "bool",
-        "bit": 2,
-    },
-    "demand_manual_heat": {
-        "address": 275,
-        "type": REG_HOLDING,
-        "count": 1,
-        "data_type": "bool",
-        "bit": 3,
-    },
-    "demand_cooling_allowed": {
-        "address": 275,
-        "type": REG_HOLDING,
-        "count": 1,
-        "data_type": "bool",
-        "bit": 4,
-    },
-    "demand_dhw_allowed": {
-        "address": 275,
-        "type": REG_HOLDING,
-        "count": 1,
-        "data_type": "bool",
-        "bit": 5,
-    },
-    "demand_heat_engine_active": {
-        "address": 275,
-        "type": REG_HOLDING,
-        "count": 1,
-        "data_type": "bool",
-        "bit": 6,
+        "data_type": "bitfield",
+        "bits": {
+            "demand_direct_zones": 0,
+            "demand_mixing_circuits": 1,
+            "demand_valves_open_safety": 2,
+            "demand_manual_heat": 3,
+            "demand_cooling_allowed": 4,
+            "demand_dhw_allowed": 5,
+            "demand_heat_engine_active": 6,
+        },
     },
     # Register 279 bits (Tab.14 - Output status 1)
-    "status_flame_on": {
-        "address": 279,
-        "type": REG_HOLDING,
-        "count": 1,
-        "data_type": "bool",
-        "bit": 0,
-    },
-    "status_heat_pump_on": {
-        "address": 279,
-        "type": REG_HOLDING,
-        "count": 1,
-        "data_type": "bool",
-        "bit": 1,
-    },
-    "status_backup1_on": {
-        "address": 279,
-        "type": REG_HOLDING,
-        "count": 1,
-        "data_type": "bool",
-        "bit": 2,
-    },
-    "status_backup2_on": {
-        "address": 279,
-        "type": REG_HOLDING,
-        "count": 1,
-        "data_type": "bool",
-        "bit": 3,
-    },
-    "status_dhw_backup_on": {
-        "address": 279,
-        "type": REG_HOLDING,
-        "count": 1,
-        "data_type": "bool",
-        "bit": 4,
-    },
-    "status_service_required": {
+    "output_status_1": {
         "address": 279,
         "type": REG_HOLDING,
         "count": 1,
-        "data_type": "bool",
-        "bit": 5,
-    },
-    "status_power_down_needed": {
-        "address": 279,
-        "type": REG_HOLDING,
-        "count": 1,
-        "data_type": "bool",
-        "bit": 6,
-    },
-    "status_water_pressure_low": {
-        "address": 279,
-        "type": REG_HOLDING,
-        "count": 1,
-        "data_type": "bool",
-        "bit": 7,
+        "data_type": "bitfield",
+        "bits": {
+            "status_flame_on": 0,
+            "status_heat_pump_on": 1,
+            "status_backup1_on": 2,
+            "status_backup2_on": 3,
+            "status_dhw_backup_on": 4,
+            "status_service_required": 5,
+            "status_power_down_needed": 6,
+            "status_water_pressure_low": 7,
+        },
     },
     # Register 280 bits (Tab.15 - Output status 2)
-    "output_pump": {
-        "address": 280,
-        "type": REG_HOLDING,
-        "count": 1,
-        "data_type": "bool",
-        "bit": 0,
-    },
-    "output_3way_valve_open": {
+    "output_status_2": {
         "address": 280,
         "type": REG_HOLDING,
         "count": 1,
-        "data_type": "bool",
-        "bit": 1,
-    },
-    "output_3way_valve": {
-        "address": 280,
-        "type": REG_HOLDING,
-        "count": 1,
-        "data_type": "bool",
-        "bit": 2,
-    },
-    "output_3way_valve_closed": {
-        "address": 280,
-        "type": REG_HOLDING,
-        "count": 1,
-        "data_type": "bool",
-        "bit": 3,
-    },
-    "output_dhw_active": {
-        "address": 280,
-        "type": REG_HOLDING,
-        "count": 1,
-        "data_type": "bool",
-        "bit": 4,
-    },
-    "output_ch_active": {
-        "address": 280,
-        "type": REG_HOLDING,
-        "count": 1,
-        "data_type": "bool",
-        "bit": 5,
-    },
-    "output_cooling_active": {
-        "address": 280,
-        "type": REG_HOLDING,
-        "count": 1,
-        "data_type": "bool",
-        "bit": 6,
+        "data_type": "bitfield",
+        "bits": {
+            "output_pump": 0,
+            "output_3way_valve_open": 1,
+            "output_3way_valve": 2,
+            "output_3way_valve_closed": 3,
+            "output_dhw_active": 4,
+            "output_ch_active": 5,
+            "output_cooling_active": 6,
+        },
     },
     # --- Appliance Enable/Disable (from German spec 7740782-01) ---
     "ch_enabled": {
@@ -1247,6 +1240,7 @@ _IWR_STATIC_REGISTER_MAP: Final = {
         "count": 1,
         "data_type": "uint16",
         "scale": 1,
+        "gate": _GATE_ERROR_PRESENT,
     },
     "board1_error_severity": {
         "address": 533,
@@ -1254,6 +1248,7 @@ _IWR_STATIC_REGISTER_MAP: Final = {
         "count": 1,
         "data_type": "uint16",
         "scale": 1,
+        "gate": _GATE_ERROR_PRESENT,
     },
     "board2_error_code": {
         "address": 534,
@@ -1261,6 +1256,7 @@ _IWR_STATIC_REGISTER_MAP: Final = {
         "count": 1,
         "data_type": "uint16",
         "scale": 1,
+        "gate": _GATE_ERROR_PRESENT,
     },
     "board2_error_severity": {
         "address": 535,
@@ -1268,6 +1264,7 @@ _IWR_STATIC_REGISTER_MAP: Final = {
         "count": 1,
         "data_type": "uint16",
         "scale": 1,
+        "gate": _GATE_ERROR_PRESENT,
     },
     "board3_error_code": {
         "address": 536,
@@ -1275,6 +1272,7 @@ _IWR_STATIC_REGISTER_MAP: Final = {
         "count": 1,
         "data_type": "uint16",
         "scale": 1,
+        "gate": _GATE_ERROR_PRESENT,
     },
     "board3_error_severity": {
         "address": 537,
@@ -1282,6 +1280,7 @@ _IWR_STATIC_REGISTER_MAP: Final = {
         "count": 1,
         "data_type": "uint16",
         "scale": 1,
+        "gate": _GATE_ERROR_PRESENT,
     },
     "board4_error_code": {
         "address": 538,
@@ -1289,6 +1288,7 @@ _IWR_STATIC_REGISTER_MAP: Final = {
         "count": 1,
         "data_type": "uint16",
         "scale": 1,
+        "gate": _GATE_ERROR_PRESENT,
     },
     "board4_error_severity": {
         "address": 539,
@@ -1296,6 +1296,7 @@ _IWR_STATIC_REGISTER_MAP: Final = {
         "count": 1,
         "data_type": "uint16",
         "scale": 1,
+        "gate": _GATE_ERROR_PRESENT,
     },
 }
 
@@ -2265,6 +2266,7 @@ def _build_zone_registers(zones: list[int]) -> dict[str, Any]:
                 "count": 1,
                 "data_type": "uint16",
                 "scale": IWR_SCALE_ROOM_TEMP,
+                "gate": _GATE_COOLING_ENABLED,
             }
         # 661 - Cooling night setback (UINT16, 0.1°C)
         registers[f"{prefix}_cooling_night_setback"] = {
@@ -2273,6 +2275,7 @@ def _build_zone_registers(zones: list[int]) -> dict[str, Any]:
             "count": 1,
             "data_type": "uint16",
             "scale": IWR_SCALE_ROOM_TEMP,
+            "gate": _GATE_COOLING_ENABLED,
         }
         # 662 - Holiday room setpoint (UINT16, 0.1°C)
         registers[f"{prefix}_holiday_setpoint"] = {
@@ -2361,6 +2364,7 @@ def _build_zone_registers(zones: list[int]) -> dict[str, Any]:
             "count": 1,
             "data_type": "uint16",
             "scale": IWR_SCALE_TEMP,
+            "gate": _GATE_COOLING_ENABLED,
         }
         # 676 - Heating curve footpoint night (UINT16, 0.1°C)
         registers[f"{prefix}_heating_curve_footpoint_night"] = {
@@ -2530,6 +2534,15 @@ def _build_zone_registers(zones: list[int]) -> dict[str, Any]:
             "data_type": "bool",
         }
 
+        # Tag every zone register with its zone and applicability rule
+        for key, config in registers.items():
+            if not key.startswith(f"{prefix}_"):
+                continue
+            config["zone_number"] = zn
+            suffix = key.removeprefix(f"{prefix}_")
+            if rule := ZONE_REGISTER_APPLICABILITY.get(suffix):
+                config["applies_to"] = rule
+
     return registers
 
 
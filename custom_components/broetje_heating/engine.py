@@ -0,0 +1,1426 @@
+"""Modbus polling engine for Brötje heating systems.
+
+Plans batch reads from the register maps in devices/, reads them over
+Modbus TCP and decodes the values into a slot store. It has no Home
+Assistant dependency: the coordinator adapts it to a DataUpdateCoordinator,
+and it can be used directly by tools.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Final
+
+from pymodbus.client import AsyncModbusTcpClient
+from pymodbus.exceptions import ModbusException
+
+from .const import (
+    BATCH_PROBE_FAILURES,
+    BATCH_SIZE_DEFAULT,
+    BATCH_SIZE_PROTOCOL_MAX,
+    BATCH_SIZE_RETRY_AFTER,
+    BATCH_TIMEOUT_MAX,
+    BREAKER_BACKOFF_MAX,
+    BREAKER_FAILURE_THRESHOLD,
+    BUSY_RETRIES,
+    BUSY_RETRY_DELAY,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_UNIT_ID,
+    EXC_ACKNOWLEDGE,
+    EXC_DEVICE_BUSY,
+    EXC_GATEWAY_PATH,
+    EXC_GATEWAY_TARGET,
+    EXC_ILLEGAL_DATA_ADDRESS,
+    EXC_ILLEGAL_DATA_VALUE,
+    GATE_RECHECK_INTERVAL,
+    GATEWAY_BACKOFF_MAX,
+    GATEWAY_BACKOFF_MIN,
+    MAX_CONSECUTIVE_TIMEOUTS,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_POLL,
+    REG_HOLDING,
+    REG_INPUT,
+)
+from .devices import DeviceType, expand_bitfields, gate_is_open, get_device_config
+from .devices.iwr import zone_register_applies
+from .scheduler import PriorityLock
+from .tuning import TransportTuning
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class EngineError(Exception):
+    """A poll failed."""
+
+
+class GatewayUnavailable(EngineError):
+    """The gateway cannot be reached or stopped responding."""
+
+
+class DeviceExceptionResponse(Exception):
+    """The device answered a read with a Modbus exception response."""
+
+    def __init__(self, code: int) -> None:
+        """Initialize with the Modbus exception code."""
+        super().__init__(f"Modbus exception code {code:#04x}")
+        self.code = code
+
+
+# Standard Modbus sentinel values indicating "not available" / "no data".
+# These are checked against the raw decoded value BEFORE scaling.
+SENTINEL_VALUES: Final[dict[str, set[int]]] = {
+    "int16": {-1},  # 0xFFFF signed
+    "uint16": {0xFFFF},  # 65535
+    "int32": {-1},  # 0xFFFFFFFF signed
+    "uint32": {0xFFFFFFFF},  # 4294967295
+}
+
+
+def decode_register(registers: list[int], offset: int, config: dict[str, Any]) -> Any:
+    """Decode the raw words of a register at an offset based on configuration.
+
+    Shared by polls and readers of raw captures, so both apply the same
+    scale and sentinel rules.
+    """
+    data_type = config.get("data_type", "int16")
+    scale = config.get("scale", 1.0)
+    bit = config.get("bit")
+
+    if data_type == "bool":
+        value = registers[offset]
+        if bit is not None:
+            return bool(value & (1 << bit))
+        return bool(value)
+
+    if data_type == "int16":
+        value = registers[offset]
+        # Convert to signed if necessary
+        if value >= 32768:
+            value -= 65536
+        if value in SENTINEL_VALUES.get("int16", ()):
+            return None
+        return value * scale
+
+    if data_type == "uint16":
+        value = registers[offset]
+        if value in SENTINEL_VALUES.get("uint16", ()):
+            return None
+        return value * scale
+
+    if data_type == "int32":
+        value = (registers[offset] << 16) | registers[offset + 1]
+        if value >= 2147483648:
+            value -= 4294967296
+        if value in SENTINEL_VALUES.get("int32", ()):
+            return None
+        return value * scale
+
+    if data_type == "uint32":
+        value = (registers[offset] << 16) | registers[offset + 1]
+        if value in SENTINEL_VALUES.get("uint32", ()):
+            return None
+        return value * scale
+
+    if data_type == "bitfield":
+        # The word itself; its named bits are split out by the caller
+        return registers[offset]
+
+    if data_type == "string":
+        # Decode registers as ASCII string
+        chars = []
+        for index in range(offset, offset + config.get("count", 1)):
+            reg = registers[index]
+            chars.append(chr((reg >> 8) & 0xFF))
+            chars.append(chr(reg & 0xFF))
+        return "".join(chars).rstrip("\x00").strip()
+
+    return registers[offset] * scale
+
+
+class BroetjeEngine:
+    """Poll a Brötje ISR/IWR module and decode its registers into slots."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        device_type: DeviceType,
+        zones: list[int] | None = None,
+        unit_id: int = DEFAULT_UNIT_ID,
+        *,
+        poll_interval: float = DEFAULT_SCAN_INTERVAL,
+        max_staleness: float = DEFAULT_MAX_STALENESS,
+    ) -> None:
+        """Initialize the engine for one module behind a Modbus TCP gateway."""
+        self.host = host
+        self.port = port
+        self.unit_id = unit_id
+        # Seconds between polls, the base of the circuit breaker backoff
+        self.poll_interval = poll_interval
+        self._client: AsyncModbusTcpClient | None = None
+        # Serializes Modbus transactions, serving interactive requests first
+        self._lock = PriorityLock()
+        # Pending reads keyed by (unit, type, start, count) for coalescing
+        self._inflight: dict[
+            tuple[int, str, int, int], asyncio.Task[list[int] | None]
+        ] = {}
+        # Timeout, retries and request spacing tuned for this gateway
+        self._tuning = TransportTuning()
+        # Largest read known to work ("good") and smallest known to fail
+        # ("bad", with the time it failed) per register type, learned by
+        # probing larger batches; unanswered probes are counted per size
+        self._batch_limits: dict[str, dict[str, Any]] = {}
+        self._last_request_at = 0.0
+        self._consecutive_timeouts = 0
+
+        # Exception-code policy: registers the device rejects as illegal
+        # addresses, and backoff after gateway path/target errors
+        self._excluded_registers: set[str] = set()
+        self._gateway_errors = 0
+        self._gateway_backoff_until: float | None = None
+
+        # Circuit breaker for unreachable gateways
+        self._failed_polls = 0
+        self._breaker_open_until: float | None = None
+
+        # Load device-specific configuration
+        zones = zones or [1]
+        self.device_type = device_type
+        self.device_config: dict[str, Any] = get_device_config(device_type, zones=zones)
+        self.register_map: dict[str, Any] = self.device_config["register_map"]
+        # Named bits of bitfield words, each resolving to its word register
+        self.bit_registers: dict[str, dict[str, Any]] = expand_bitfields(
+            self.register_map
+        )
+        self._zones: list[int] = zones if device_type == DeviceType.IWR else []
+
+        # Data store: one preallocated slot per register (and bitfield bit),
+        # indexed by a stable integer assigned here. Polls update the slots
+        # in place.
+        self.register_slots: dict[str, int] = {
+            key: slot
+            for slot, key in enumerate([*self.register_map, *self.bit_registers])
+        }
+        self.slots: list[Any] = [None] * len(self.register_slots)
+        self._slot_keys: list[str] = list(self.register_slots)
+
+        # Last-known-good: time of the last successful read per slot. When a
+        # read fails the slot keeps its value (marked stale) until it is older
+        # than max_staleness seconds.
+        self.read_at: list[float | None] = [None] * len(self.register_slots)
+        self.stale_slots: set[int] = set()
+        self.max_staleness = max_staleness
+
+        # Detected zone type/function per zone number, used to prune zone
+        # registers that do not apply (e.g. cooling setpoints on a DHW zone)
+        self._zone_profiles: dict[int, tuple[int | None, int | None]] = {}
+
+        # Last raw word per bitfield register, so unchanged bits are not
+        # decoded again
+        self._bitfield_words: dict[str, int] = {}
+
+        # Raw payload of every batch read in the last poll, used to skip
+        # decoding and notifications for unchanged batches
+        self._batch_payloads: dict[tuple[str, int, int], list[int]] = {}
+        # When each batch was last read, so served payloads age out
+        self._batch_read_at: dict[tuple[str, int, int], float] = {}
+        self._polled_batches: set[tuple[str, int, int]] = set()
+        # Slots whose value changed in the last poll or refresh
+        self.changed_slots: set[int] = set()
+        # Every batch read in the last poll or refresh with its duration in
+        # seconds, for tools measuring gateway performance
+        self.batch_timings: list[dict[str, Any]] = []
+
+        # Registers that gate other register groups, with their last read value
+        self._gating_registers: set[str] = {
+            config["gate"]["register"]
+            for config in self.register_map.values()
+            if "gate" in config
+        }
+        self._gate_values: dict[str, Any] = {}
+        self._gates_checked_at: float | None = None
+
+    @property
+    def breaker_open(self) -> bool:
+        """Return whether polls are paused for an unreachable gateway."""
+        return self._breaker_open_until is not None
+
+    def profile(self) -> dict[str, Any]:
+        """Return what is learned about the gateway, for persisting."""
+        return {
+            "transport": self._tuning.as_dict(),
+            "batch_limits": self._batch_limits,
+        }
+
+    def restore_profile(self, profile: dict[str, Any]) -> None:
+        """Restore what was learned about the gateway with profile()."""
+        self._tuning = TransportTuning.from_dict(profile.get("transport", {}))
+        self._batch_limits = profile.get("batch_limits", {})
+        _LOGGER.debug("Restored transport tuning: %s", self._tuning.as_dict())
+
+    async def setup(self) -> None:
+        """Connect and read what the poll plan depends on (zone profiles)."""
+        await self._connect()
+        await self._read_zone_profiles()
+
+    async def close(self) -> None:
+        """Close the connection to the gateway."""
+        await self._disconnect()
+
+    def all_registers(self) -> set[str]:
+        """Return every register that applies to the configured zones."""
+        return {key for key in self.register_map if self.register_applies(key)}
+
+    async def _connect(self) -> None:
+        """Establish connection to the Modbus device."""
+        if self._client is not None and self._client.connected:
+            return
+
+        # Timeouts and retries are applied per transaction by the engine
+        # from the tuned values, so the client never times out on its own
+        self._client = AsyncModbusTcpClient(
+            host=self.host,
+            port=self.port,
+            timeout=BATCH_TIMEOUT_MAX,
+            retries=0,
+        )
+
+        if not await self._client.connect():
+            raise GatewayUnavailable(f"Failed to connect to {self.host}:{self.port}")
+
+        _LOGGER.debug("Connected to Modbus device at %s:%s", self.host, self.port)
+
+    async def _disconnect(self) -> None:
+        """Disconnect from the Modbus device."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+            _LOGGER.debug("Disconnected from Modbus device")
+
+    async def _read_zone_profiles(self) -> None:
+        """Read zone_type and zone_function for every configured zone."""
+        for zone in self._zones:
+            type_config = self.register_map[f"zone{zone}_zone_type"]
+            # zone_type and zone_function are adjacent (640/641 + 512n)
+            result = await self._read_registers(
+                type_config["address"], 2, type_config["type"]
+            )
+            if result is None:
+                _LOGGER.debug("Zone %d: type unknown, polling all registers", zone)
+                continue
+            self._zone_profiles[zone] = (result[0], result[1])
+
+        _LOGGER.debug("Zone profiles (type, function): %s", self._zone_profiles)
+
+    def _update_zone_profiles(self) -> None:
+        """Refresh zone profiles from polled zone_type/zone_function values."""
+        for zone in self._zones:
+            zone_type = self.get_value(f"zone{zone}_zone_type")
+            if zone_type is None:
+                continue
+            zone_function = self.get_value(f"zone{zone}_function")
+            profile = (
+                int(zone_type),
+                int(zone_function) if zone_function is not None else None,
+            )
+            if self._zone_profiles.get(zone, profile) != profile:
+                _LOGGER.info(
+                    "Zone %d type/function changed to %s; reload to apply",
+                    zone,
+                    profile,
+                )
+            self._zone_profiles[zone] = profile
+
+    def get_value(self, register_key: str) -> Any:
+        """Return the current value of a register or bitfield bit."""
+        return self.slots[self.register_slots[register_key]]
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a dict copy of all register values (for diagnostics/tools)."""
+        return dict(zip(self.register_slots, self.slots, strict=True))
+
+    def value_is_fresh(self, slot: int) -> bool:
+        """Return whether a slot holds a value within the staleness limit."""
+        read_at = self.read_at[slot]
+        return (
+            self.slots[slot] is not None
+            and read_at is not None
+            and time.time() - read_at <= self.max_staleness
+        )
+
+    def next_expiry(self) -> float | None:
+        """Return when the oldest held value exceeds the staleness limit."""
+        read_times = [
+            read_at
+            for value, read_at in zip(self.slots, self.read_at, strict=True)
+            if value is not None and read_at is not None
+        ]
+        return min(read_times) + self.max_staleness if read_times else None
+
+    def expire_values(self) -> bool:
+        """Clear values older than the staleness limit between polls.
+
+        Polls only expire the values of batches they fail to read; this
+        covers failed polls, an open breaker and bursts, during which no
+        batch is read. Returns whether any slot changed.
+        """
+        now = time.time()
+        changed: set[int] = set()
+        for slot, read_at in enumerate(self.read_at):
+            if read_at is not None and now - read_at > self.max_staleness:
+                self._keep_or_expire(slot, now, changed)
+        self.changed_slots |= changed
+        return bool(changed)
+
+    def get_register_config(self, register_key: str) -> dict[str, Any] | None:
+        """Return the register config for a register or named bitfield bit."""
+        return self.register_map.get(register_key) or self.bit_registers.get(
+            register_key
+        )
+
+    def poll_key(self, register_key: str) -> str:
+        """Return the register to poll for a key (bitfield word for a bit)."""
+        if (bit_config := self.bit_registers.get(register_key)) is not None:
+            return bit_config["bitfield"]
+        return register_key
+
+    def register_applies(self, register_key: str) -> bool:
+        """Return whether a register applies to its zone's detected type."""
+        config = self.register_map[self.poll_key(register_key)]
+        rule = config.get("applies_to")
+        if rule is None:
+            return True
+
+        zone_type, zone_function = self._zone_profiles.get(
+            config["zone_number"], (None, None)
+        )
+        return zone_register_applies(rule, zone_type, zone_function)
+
+    async def read_registers(
+        self,
+        address: int,
+        count: int,
+        register_type: str,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> list[int] | None:
+        """Read registers through the engine's connection, or None on failure.
+
+        For callers outside the poll loop (e.g. zone detection in the options
+        flow), so they share the lock and coalescing of the polling reads.
+        By default the read is interactive: it is served ahead of queued
+        poll batches.
+        """
+        return await self._read_registers(address, count, register_type, priority)
+
+    async def forward_read(
+        self, address: int, count: int, register_type: str
+    ) -> list[int] | None:
+        """Read registers on behalf of another Modbus client.
+
+        Like read_registers, but raises DeviceExceptionResponse for exception
+        replies so their code can be passed on. Returns None on transport
+        errors.
+        """
+        return await self._request(address, count, register_type, PRIORITY_INTERACTIVE)
+
+    def cached_registers(
+        self, register_type: str, address: int, count: int
+    ) -> list[int] | None:
+        """Return the raw words of a range from the last poll, if it covered it.
+
+        Only ranges within one batch read in the last poll are served; a
+        batch that failed is not cached. Payloads older than the staleness
+        limit (a poll cut short, polls suspended for a burst) are not served.
+        """
+        end = address + count
+        now = time.time()
+        for batch_key, words in self._batch_payloads.items():
+            reg_type, start, length = batch_key
+            if (
+                reg_type == register_type
+                and start <= address
+                and end <= start + length
+                and now - self._batch_read_at[batch_key] <= self.max_staleness
+            ):
+                return words[address - start : end - start]
+        return None
+
+    def plan_reads(self, register_keys: set[str]) -> list[tuple[str, int, int]]:
+        """Return (type, address, count) reads covering the given registers.
+
+        A fixed plan for reading the same registers repeatedly with
+        read_raw(), without batch size probes.
+        """
+        return [
+            (
+                batch["type"],
+                batch["start_address"],
+                batch["end_address"] - batch["start_address"] + 1,
+            )
+            for batch in self.plan_batches(
+                {self.poll_key(key) for key in register_keys}, probe=False
+            )
+        ]
+
+    async def read_raw(
+        self, reads: list[tuple[str, int, int]]
+    ) -> dict[tuple[str, int, int], list[int] | None]:
+        """Read a plan from plan_reads() and return the raw words per read.
+
+        The slot store is not touched, so entities see nothing of these
+        reads. A failed read maps to None. Raises GatewayUnavailable while
+        the circuit breaker is open or once the gateway stops responding.
+        """
+        if self._breaker_open_until is not None:
+            raise GatewayUnavailable("Gateway unreachable")
+        results: dict[tuple[str, int, int], list[int] | None] = {}
+        for read in reads:
+            register_type, address, count = read
+            results[read] = await self._read_registers(address, count, register_type)
+            if (
+                results[read] is None
+                and self._consecutive_timeouts >= MAX_CONSECUTIVE_TIMEOUTS
+            ):
+                raise GatewayUnavailable(
+                    f"No response to {self._consecutive_timeouts} consecutive requests"
+                )
+        return results
+
+    async def _read_registers(
+        self,
+        address: int,
+        count: int,
+        register_type: str,
+        priority: int = PRIORITY_POLL,
+    ) -> list[int] | None:
+        """Read registers from the Modbus device, or None if the read failed."""
+        try:
+            return await self._request(address, count, register_type, priority)
+        except DeviceExceptionResponse:
+            return None
+
+    async def _request(
+        self,
+        address: int,
+        count: int,
+        register_type: str,
+        priority: int,
+    ) -> list[int] | None:
+        """Read registers, raising DeviceExceptionResponse on exception replies.
+
+        Returns None on transport errors. Concurrent reads of the same range
+        are coalesced: a second caller awaits the pending read of the first
+        instead of issuing a duplicate Modbus transaction. The pending read
+        takes on the most urgent priority of its callers, so an interactive
+        caller joining a poll's read does not wait behind other poll batches.
+        """
+        request = (self.unit_id, register_type, address, count)
+        if (pending := self._inflight.get(request)) is None:
+            pending = asyncio.ensure_future(
+                self._read_with_policy(address, count, register_type, priority)
+            )
+            self._inflight[request] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(request, None))
+        else:
+            _LOGGER.debug("Joining in-flight read: %s", request)
+            self._lock.promote(pending, priority)
+
+        # Shield so one cancelled caller does not cancel the read for others
+        return await asyncio.shield(pending)
+
+    async def _read_with_policy(
+        self,
+        address: int,
+        count: int,
+        register_type: str,
+        priority: int,
+    ) -> list[int] | None:
+        """Read registers, applying the retry policy for the exception code.
+
+        Requests without response are retried as often as the tuned retry
+        count allows, unless the gateway looks hung. Busy replies
+        (0x05/0x06) are retried a few times with short delays, releasing the
+        lock in between. Gateway path/target errors
+        (0x0A/0x0B) mean the bus behind the gateway is down: no request is
+        sent until a growing backoff expires.
+        """
+        if self._gateway_backing_off():
+            return None
+
+        attempt = 0
+        timeouts = 0
+        while True:
+            try:
+                result = await self._read_registers_locked(
+                    address, count, register_type, priority
+                )
+            except TimeoutError:
+                # No retries once a previous request went unanswered as well:
+                # the gateway is more likely hung than dropping a packet
+                if timeouts < self._tuning.retries and not self._consecutive_timeouts:
+                    timeouts += 1
+                    continue
+                self._consecutive_timeouts += 1
+                _LOGGER.warning(
+                    "Timeout reading %d %s registers at %d (%d in a row)",
+                    count,
+                    register_type,
+                    address,
+                    self._consecutive_timeouts,
+                )
+                return None
+            except DeviceExceptionResponse as err:
+                if (
+                    err.code in (EXC_ACKNOWLEDGE, EXC_DEVICE_BUSY)
+                    and attempt < BUSY_RETRIES
+                ):
+                    _LOGGER.debug(
+                        "Device busy (%s) reading address %d, retrying", err, address
+                    )
+                    self._tuning.record_overrun()
+                    await asyncio.sleep(BUSY_RETRY_DELAY * 2**attempt)
+                    attempt += 1
+                    continue
+                if err.code in (EXC_GATEWAY_PATH, EXC_GATEWAY_TARGET):
+                    self._start_gateway_backoff(err)
+                elif err.code != EXC_ILLEGAL_DATA_ADDRESS:
+                    _LOGGER.warning("Modbus error reading address %s: %s", address, err)
+                raise
+
+            if result is not None:
+                self._gateway_errors = 0
+                self._gateway_backoff_until = None
+            return result
+
+    def _gateway_backing_off(self) -> bool:
+        """Return whether requests are paused after gateway path/target errors.
+
+        The pause ends at its deadline, not at the next successful read.
+        """
+        if self._gateway_backoff_until is None:
+            return False
+        if time.monotonic() < self._gateway_backoff_until:
+            return True
+        self._gateway_backoff_until = None
+        return False
+
+    def _start_gateway_backoff(self, err: DeviceExceptionResponse) -> None:
+        """Pause requests after a gateway reported its downstream bus failing."""
+        backoff = min(
+            GATEWAY_BACKOFF_MIN * 2**self._gateway_errors, GATEWAY_BACKOFF_MAX
+        )
+        self._gateway_errors += 1
+        self._gateway_backoff_until = time.monotonic() + backoff
+        _LOGGER.warning(
+            "Gateway at %s:%s cannot reach the device (%s), "
+            "pausing requests for %d seconds",
+            self.host,
+            self.port,
+            err,
+            backoff,
+        )
+
+    async def _read_registers_locked(
+        self,
+        address: int,
+        count: int,
+        register_type: str,
+        priority: int,
+    ) -> list[int] | None:
+        """Read registers from the Modbus device under the connection lock.
+
+        Raises TimeoutError if the device did not answer in time.
+        """
+        async with self._lock.hold(priority):
+            try:
+                await self._connect()
+
+                # Keep the tuned minimum gap after the previous request
+                wait = self._last_request_at + self._tuning.gap - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+                started = time.monotonic()
+                async with asyncio.timeout(self._tuning.timeout):
+                    if register_type == REG_INPUT:
+                        result = await self._client.read_input_registers(
+                            address=address, count=count, device_id=self.unit_id
+                        )
+                    elif register_type == REG_HOLDING:
+                        result = await self._client.read_holding_registers(
+                            address=address, count=count, device_id=self.unit_id
+                        )
+                    else:
+                        _LOGGER.error("Unknown register type: %s", register_type)
+                        return None
+
+                # Any response, including an exception response, is a round trip
+                self._consecutive_timeouts = 0
+                self._tuning.record_response(time.monotonic() - started)
+
+                if result.isError():
+                    if code := getattr(result, "exception_code", None):
+                        raise DeviceExceptionResponse(code)
+                    _LOGGER.warning(
+                        "Modbus error reading address %s: %s",
+                        address,
+                        result,
+                    )
+                    return None
+
+                # pymodbus already decoded the PDU into a fresh list; keep it
+                # as the batch buffer and let decoders index into it
+                return result.registers
+
+            except TimeoutError:
+                self._tuning.record_error()
+                _LOGGER.debug(
+                    "Timeout reading %s registers at %d", register_type, address
+                )
+                # A late response would desync transaction IDs on this connection
+                await self._disconnect()
+                raise
+
+            except ModbusException as err:
+                self._tuning.record_overrun()
+                _LOGGER.error("Modbus exception: %s", err)
+                await self._disconnect()
+                return None
+
+            finally:
+                self._last_request_at = time.monotonic()
+
+    def plan_batches(
+        self, register_keys: set[str], *, probe: bool = True
+    ) -> list[dict[str, Any]]:
+        """Group registers into batches for efficient reading.
+
+        Groups consecutive or near-consecutive registers to minimize
+        the number of Modbus read operations. Reading a few unused
+        registers between needed ones is much cheaper than making
+        separate Modbus requests. With probe, one batch per register type
+        may be grown to learn whether the gateway reads larger batches.
+        """
+        # Registers the device rejected as illegal addresses are never read
+        register_keys = register_keys - self._excluded_registers
+        if not register_keys:
+            return []
+
+        # Max gap between registers to still batch them together.
+        # Must be 0 (truly consecutive only) because the Brötje device has gaps
+        # in its register map (e.g., 24594 exists, 24595 doesn't, 24596 exists).
+        # Reading non-existent addresses causes batch read failures.
+        # Note: With the formula (addr <= end + MAX_GAP + 1), MAX_GAP=0 means
+        # only consecutive addresses (gap of 1) are batched.
+        MAX_GAP = 0
+
+        # Build list of register info and sort by type, then address
+        registers: list[dict[str, Any]] = []
+        for key in register_keys:
+            config = self.register_map[key]
+            registers.append(
+                {
+                    "key": key,
+                    "address": config["address"],
+                    "count": config.get("count", 1),
+                    "type": config["type"],
+                    "config": config,
+                    "slot": self.register_slots[key],
+                    # (slot, bit) for every named bit of a bitfield word
+                    "bits": [
+                        (self.register_slots[bit_key], bit)
+                        for bit_key, bit in config.get("bits", {}).items()
+                    ],
+                }
+            )
+
+        # Sort by register type first (to group holding/input), then by address
+        registers.sort(key=lambda x: (x["type"], x["address"]))
+
+        # Group into batches
+        batches: list[dict[str, Any]] = []
+        current_batch: dict[str, Any] | None = None
+
+        for reg in registers:
+            reg_end = reg["address"] + reg["count"] - 1
+
+            if current_batch is None:
+                # Start new batch
+                current_batch = {
+                    "type": reg["type"],
+                    "start_address": reg["address"],
+                    "end_address": reg_end,
+                    "registers": [reg],
+                }
+            elif (
+                reg["type"] == current_batch["type"]
+                and reg["address"] <= current_batch["end_address"] + MAX_GAP + 1
+                and (reg_end - current_batch["start_address"] + 1)
+                <= self._batch_size_limits(reg["type"])["good"]
+            ):
+                # Add to current batch
+                current_batch["registers"].append(reg)
+                current_batch["end_address"] = max(
+                    current_batch["end_address"], reg_end
+                )
+            else:
+                # Finish current batch and start new one
+                batches.append(current_batch)
+                current_batch = {
+                    "type": reg["type"],
+                    "start_address": reg["address"],
+                    "end_address": reg_end,
+                    "registers": [reg],
+                }
+
+        if current_batch:
+            batches.append(current_batch)
+
+        if probe:
+            self._plan_batch_size_probe(batches)
+
+        return batches
+
+    def _batch_size_limits(self, register_type: str) -> dict[str, Any]:
+        """Return the learned read size limits for a register type."""
+        return self._batch_limits.setdefault(
+            register_type,
+            {"good": BATCH_SIZE_DEFAULT, "bad": BATCH_SIZE_PROTOCOL_MAX + 1},
+        )
+
+    def _plan_batch_size_probe(self, batches: list[dict[str, Any]]) -> None:
+        """Grow one batch per register type past the known-good size.
+
+        Registers of the following batches are moved into a batch as long as
+        the addresses in between belong to readable registers: up to the
+        protocol maximum until a size has failed, then halfway between the
+        known-good and the smallest failed size. Reading it shows whether
+        the gateway handles the larger size, converging on the limit in a
+        few polls. A failed size is probed again after BATCH_SIZE_RETRY_AFTER.
+        """
+        probed: set[str] = set()
+        readable: dict[str, set[int]] = {}
+        index = 0
+        while index < len(batches) - 1:
+            batch = batches[index]
+            index += 1
+            reg_type = batch["type"]
+            if reg_type in probed or batches[index]["type"] != reg_type:
+                continue
+
+            limits = self._batch_size_limits(reg_type)
+            if (
+                limits["bad"] <= BATCH_SIZE_PROTOCOL_MAX
+                and time.time() - limits.get("bad_at", 0) >= BATCH_SIZE_RETRY_AFTER
+            ):
+                # The gateway (firmware, bus load) may have changed since
+                limits["bad"] = BATCH_SIZE_PROTOCOL_MAX + 1
+            if limits["bad"] > BATCH_SIZE_PROTOCOL_MAX:
+                ceiling = BATCH_SIZE_PROTOCOL_MAX
+            else:
+                ceiling = (limits["good"] + limits["bad"]) // 2
+            if reg_type not in readable:
+                readable[reg_type] = self._readable_addresses(reg_type)
+
+            # Plan the growth first: only a batch grown past the good size
+            # is a probe, smaller merges are left to the regular planning
+            end = batch["end_address"]
+            moves: list[tuple[dict[str, Any], int]] = []
+            for following in batches[index:]:
+                if following["type"] != reg_type or not readable[reg_type].issuperset(
+                    range(end + 1, following["start_address"])
+                ):
+                    break
+                moved = 0
+                for reg in following["registers"]:
+                    reg_end = reg["address"] + reg["count"] - 1
+                    if reg_end - batch["start_address"] + 1 > ceiling:
+                        break
+                    end = max(end, reg_end)
+                    moved += 1
+                if moved:
+                    moves.append((following, moved))
+                if moved < len(following["registers"]):
+                    break
+            if end - batch["start_address"] + 1 <= limits["good"]:
+                continue
+
+            probed.add(reg_type)
+            for following, moved in moves:
+                batch["registers"].extend(following["registers"][:moved])
+                del following["registers"][:moved]
+                if following["registers"]:
+                    following["start_address"] = following["registers"][0]["address"]
+            batch["end_address"] = end
+            batches[index:] = [
+                following for following in batches[index:] if following["registers"]
+            ]
+            _LOGGER.debug(
+                "Probing %s batch size %d at address %d",
+                reg_type,
+                end - batch["start_address"] + 1,
+                batch["start_address"],
+            )
+
+    def _readable_addresses(self, register_type: str) -> set[int]:
+        """Return the addresses a read of the given type may span."""
+        return {
+            address
+            for key, config in self.register_map.items()
+            if config["type"] == register_type
+            and key not in self._excluded_registers
+            and self.register_applies(key)
+            for address in range(
+                config["address"], config["address"] + config.get("count", 1)
+            )
+        }
+
+    def _record_batch_size(
+        self,
+        register_type: str,
+        count: int,
+        success: bool,
+        *,
+        rejected: bool = False,
+    ) -> None:
+        """Update the learned read size limits from a batch outcome.
+
+        A size the gateway rejected (illegal data value) fails at once; an
+        unanswered read only after BATCH_PROBE_FAILURES in a row at that size
+        or larger, until a read of that size succeeds.
+        """
+        limits = self._batch_size_limits(register_type)
+        if success:
+            if count >= limits.get("failed_size", count + 1):
+                limits.pop("failed_size")
+                limits.pop("failures")
+            if count > limits["good"]:
+                limits["good"] = count
+                _LOGGER.info(
+                    "Gateway reads %d %s registers per request", count, register_type
+                )
+        elif count < limits["bad"]:
+            if not rejected:
+                # Larger reads failing as well count toward the smallest size
+                count = min(count, limits.get("failed_size", count))
+                limits["failed_size"] = count
+                limits["failures"] = limits.get("failures", 0) + 1
+                if limits["failures"] < BATCH_PROBE_FAILURES:
+                    _LOGGER.debug(
+                        "No response to %d or more %s registers (%d in a row)",
+                        count,
+                        register_type,
+                        limits["failures"],
+                    )
+                    return
+            limits.pop("failed_size", None)
+            limits.pop("failures", None)
+            limits["bad"] = count
+            limits["bad_at"] = time.time()
+            if count <= limits["good"]:
+                # A size within the good limit failed: back off further
+                limits["good"] = max(count // 2, 1)
+            _LOGGER.info(
+                "Gateway failed to read %d %s registers per request, "
+                "limiting batches to %d",
+                count,
+                register_type,
+                limits["good"],
+            )
+
+    def _gates_due(self) -> bool:
+        """Return whether gating registers should be re-read this poll."""
+        return bool(self._gating_registers) and (
+            self._gates_checked_at is None
+            or time.monotonic() - self._gates_checked_at >= GATE_RECHECK_INTERVAL
+        )
+
+    def _gate_open(self, register_key: str) -> bool:
+        """Return whether a register's gate (if any) is currently open."""
+        return gate_is_open(
+            self.register_map[register_key].get("gate"), self._gate_values
+        )
+
+    async def _read_batches(
+        self,
+        batches: list[dict[str, Any]],
+        changed: set[int],
+        timings: list[dict[str, Any]],
+        polled: set[tuple[str, int, int]],
+        priority: int = PRIORITY_POLL,
+    ) -> None:
+        """Read the given batches and store decoded values in their slots.
+
+        Slots whose value changed are added to changed, every read is
+        recorded in timings and every batch key is added to polled, all
+        owned by the caller: an interactive refresh may run between the
+        batches of a poll and must not touch the poll's bookkeeping.
+
+        A batch whose raw payload equals the one read in the previous poll is
+        not decoded again and its slots are not reported as changed. The lock
+        is taken per batch, so interactive requests can run in between.
+
+        Each batch has its own timeout; a failed batch does not discard the
+        others, and its registers keep their last good values while those are
+        within the staleness limit. Raises TimeoutError once the gateway stops
+        responding. A batch left unanswered while smaller ones of its type
+        went through counts against its size, so a gateway that cannot read
+        the planned sizes gets smaller batches.
+        """
+        # Smallest answered and every unanswered batch size per register type
+        answered: dict[str, int] = {}
+        unanswered: list[tuple[str, int]] = []
+
+        for batch in batches:
+            start_addr = batch["start_address"]
+            count = batch["end_address"] - start_addr + 1
+            batch_key = (batch["type"], start_addr, count)
+            polled.add(batch_key)
+
+            _LOGGER.debug(
+                "Batch read: type=%s, address=%d, count=%d (%d registers)",
+                batch["type"],
+                start_addr,
+                count,
+                len(batch["registers"]),
+            )
+
+            started = time.monotonic()
+            replied = False
+            try:
+                result = await self._request(start_addr, count, batch["type"], priority)
+            except DeviceExceptionResponse as err:
+                replied = True
+                if err.code == EXC_ILLEGAL_DATA_ADDRESS:
+                    self._record_batch_timing(timings, batch_key, started, ok=False)
+                    polled.discard(batch_key)
+                    self._batch_payloads.pop(batch_key, None)
+                    await self._isolate_illegal_addresses(
+                        batch, changed, timings, polled, priority
+                    )
+                    continue
+                if err.code == EXC_ILLEGAL_DATA_VALUE and count > 1:
+                    # Quantity rejected: the gateway reads fewer at once
+                    self._record_batch_size(
+                        batch["type"], count, success=False, rejected=True
+                    )
+                result = None
+            self._record_batch_timing(
+                timings, batch_key, started, ok=result is not None
+            )
+
+            if result is not None:
+                answered[batch["type"]] = min(count, answered.get(batch["type"], count))
+                self._record_batch_size(batch["type"], count, success=True)
+            elif not replied and not self._gateway_backing_off():
+                if count > self._batch_size_limits(batch["type"])["good"]:
+                    # A probe of a larger batch size
+                    self._record_batch_size(batch["type"], count, success=False)
+                else:
+                    unanswered.append((batch["type"], count))
+
+            if result is None:
+                if self._consecutive_timeouts >= MAX_CONSECUTIVE_TIMEOUTS:
+                    raise TimeoutError(
+                        f"No response to {self._consecutive_timeouts} "
+                        "consecutive requests"
+                    )
+                # Batch read failed: keep last good values until they expire
+                now = time.time()
+                self._batch_payloads.pop(batch_key, None)
+                for reg in batch["registers"]:
+                    self._bitfield_words.pop(reg["key"], None)
+                    self._gate_values.pop(reg["key"], None)
+                    for slot in (reg["slot"], *(slot for slot, _ in reg["bits"])):
+                        self._keep_or_expire(slot, now, changed)
+                continue
+
+            now = time.time()
+            self._batch_read_at[batch_key] = now
+            for reg in batch["registers"]:
+                for slot in (reg["slot"], *(slot for slot, _ in reg["bits"])):
+                    self.read_at[slot] = now
+                    if slot in self.stale_slots:
+                        # Fresh again: drop the last read time from its state
+                        self.stale_slots.discard(slot)
+                        changed.add(slot)
+
+            if result == self._batch_payloads.get(batch_key):
+                # Same raw words as last poll: slots already hold the values
+                continue
+
+            self._batch_payloads[batch_key] = result
+            self._decode_batch(batch, result, changed)
+
+        for reg_type, count in unanswered:
+            if answered.get(reg_type, count) < count:
+                # The gateway answers, just not this many registers at once
+                self._record_batch_size(reg_type, count, success=False)
+
+    def _record_batch_timing(
+        self,
+        timings: list[dict[str, Any]],
+        batch_key: tuple[str, int, int],
+        started: float,
+        *,
+        ok: bool,
+    ) -> None:
+        """Record how long a batch read took."""
+        register_type, address, count = batch_key
+        timings.append(
+            {
+                "type": register_type,
+                "address": address,
+                "count": count,
+                "duration": time.monotonic() - started,
+                "ok": ok,
+            }
+        )
+
+    async def _isolate_illegal_addresses(
+        self,
+        batch: dict[str, Any],
+        changed: set[int],
+        timings: list[dict[str, Any]],
+        polled: set[tuple[str, int, int]],
+        priority: int,
+    ) -> None:
+        """Split a batch rejected with 0x02 to find and exclude the bad registers.
+
+        The halves are read (and split further) like normal batches, so the
+        valid registers still get their values this poll.
+        """
+        registers = batch["registers"]
+        if len(registers) == 1:
+            reg = registers[0]
+            _LOGGER.warning(
+                "Register %s (address %d) is not readable on this device, "
+                "excluding it from polling",
+                reg["key"],
+                reg["address"],
+            )
+            self._excluded_registers.add(reg["key"])
+            for slot in (reg["slot"], *(slot for slot, _ in reg["bits"])):
+                self.stale_slots.discard(slot)
+                self._store(slot, None, changed)
+            return
+
+        middle = len(registers) // 2
+        halves = [
+            {
+                "type": batch["type"],
+                "start_address": part[0]["address"],
+                "end_address": max(reg["address"] + reg["count"] - 1 for reg in part),
+                "registers": part,
+            }
+            for part in (registers[:middle], registers[middle:])
+        ]
+        await self._read_batches(halves, changed, timings, polled, priority)
+
+    def _keep_or_expire(self, slot: int, now: float, changed: set[int]) -> None:
+        """Keep a slot's value after a failed read, or clear it once too old."""
+        if self.slots[slot] is None:
+            return
+        read_at = self.read_at[slot]
+        if read_at is not None and now - read_at <= self.max_staleness:
+            if slot not in self.stale_slots:
+                self.stale_slots.add(slot)
+                changed.add(slot)
+            return
+        self.stale_slots.discard(slot)
+        self._store(slot, None, changed)
+        # Unchanged raw words must not skip decoding the next read
+        key = self.poll_key(self._slot_keys[slot])
+        self._forget_raw(key)
+        # An unknown gate is open: an old "closed" must not hide registers
+        self._gate_values.pop(key, None)
+
+    def _forget_raw(self, register_key: str) -> None:
+        """Drop the cached raw words of a register and the batches covering it."""
+        config = self.register_map[register_key]
+        self._bitfield_words.pop(register_key, None)
+        for batch_key in list(self._batch_payloads):
+            reg_type, start, count = batch_key
+            if (
+                reg_type == config["type"]
+                and start <= config["address"] < start + count
+            ):
+                del self._batch_payloads[batch_key]
+                self._batch_read_at.pop(batch_key, None)
+
+    def _store(self, slot: int, value: Any, changed: set[int]) -> None:
+        """Store a decoded value in its slot, recording it if it changed."""
+        if self.slots[slot] != value:
+            self.slots[slot] = value
+            changed.add(slot)
+
+    def _decode_batch(
+        self, batch: dict[str, Any], result: list[int], changed: set[int]
+    ) -> None:
+        """Decode every register of a batch from its raw response words.
+
+        Registers are decoded in place at their offset in the batch buffer,
+        without slicing a per-register copy.
+        """
+        start_addr = batch["start_address"]
+        available = len(result)
+
+        for reg in batch["registers"]:
+            offset = reg["address"] - start_addr
+
+            if offset + reg["count"] > available:
+                _LOGGER.warning(
+                    "Incomplete data for register %s at address %d",
+                    reg["key"],
+                    reg["address"],
+                )
+                self._store(reg["slot"], None, changed)
+                continue
+
+            if reg["bits"]:
+                self._decode_bitfield(
+                    reg["key"], reg["slot"], reg["bits"], result[offset], changed
+                )
+                continue
+
+            value = self._process_register_value(result, offset, reg["config"])
+            self._store(reg["slot"], value, changed)
+            if reg["key"] in self._gating_registers:
+                self._gate_values[reg["key"]] = value
+
+    def _decode_bitfield(
+        self,
+        word_key: str,
+        slot: int,
+        bits: list[tuple[int, int]],
+        word: int,
+        changed: set[int],
+    ) -> None:
+        """Fan a bitfield word out into its bit slots, decoding changed bits only."""
+        previous = self._bitfield_words.get(word_key)
+        if previous == word:
+            return
+
+        self._bitfield_words[word_key] = word
+        self._store(slot, word, changed)
+        flipped = -1 if previous is None else word ^ previous
+        for bit_slot, bit in bits:
+            if flipped >> bit & 1:
+                self._store(bit_slot, bool(word >> bit & 1), changed)
+
+    async def refresh_register(self, register_key: str) -> bool:
+        """Read a single register and merge it into the current data.
+
+        Used for on-demand refreshes of one value, without a full poll of
+        every register. Returns whether any slot changed.
+        """
+        if self._breaker_open_until is not None:
+            _LOGGER.debug("Gateway unreachable, not refreshing %s", register_key)
+            return False
+
+        key = self.poll_key(register_key)
+
+        # Cached payloads of batches covering this register would be stale
+        # relative to the value read now, so force them to be decoded again
+        self._forget_raw(key)
+
+        # A poll may be in flight: its change set, timings and polled
+        # batches are left alone
+        changed: set[int] = set()
+        try:
+            await self._read_batches(
+                self.plan_batches({key}), changed, [], set(), PRIORITY_INTERACTIVE
+            )
+        except (TimeoutError, GatewayUnavailable) as err:
+            # Left to the next scheduled poll to mark the update as failed
+            _LOGGER.debug("Refresh of %s failed: %s", register_key, err)
+
+        # Merged into the last poll's changes, so listeners write these slots
+        self.changed_slots |= changed
+        return bool(changed)
+
+    async def poll(self, register_keys: set[str]) -> list[Any]:
+        """Read the given registers into the slot store and return the slots.
+
+        Registers of bitfield bits, closed gates and zones they do not apply
+        to are resolved here. Raises EngineError if the poll failed; polls
+        are skipped while the circuit breaker is open.
+        """
+        if self._breaker_open_until is not None:
+            remaining = self._breaker_open_until - time.monotonic()
+            if remaining > 0:
+                raise GatewayUnavailable(
+                    f"Gateway unreachable, next attempt in {remaining:.0f} s"
+                )
+            # Half-open: a single cheap read decides whether to poll again
+            await self._probe_gateway()
+
+        try:
+            data = await self._poll(register_keys)
+        except EngineError:
+            self._record_poll_failure()
+            raise
+
+        if self._failed_polls:
+            _LOGGER.debug("Poll succeeded after %d failures", self._failed_polls)
+        self._failed_polls = 0
+        self._breaker_open_until = None
+        return data
+
+    async def _probe_gateway(self) -> None:
+        """Read one register to check an unreachable gateway is back."""
+        probe = next(iter(self.register_map.values()))
+        try:
+            result = await self._request(
+                probe["address"], 1, probe["type"], PRIORITY_POLL
+            )
+        except DeviceExceptionResponse:
+            # An exception response still shows the gateway is reachable
+            result = []
+        except GatewayUnavailable:
+            result = None
+
+        if result is None:
+            self._record_poll_failure()
+            raise GatewayUnavailable("Gateway still unreachable")
+
+        _LOGGER.info(
+            "Modbus device at %s:%s is responding again, resuming polls",
+            self.host,
+            self.port,
+        )
+
+    def _record_poll_failure(self) -> None:
+        """Count a failed poll and open the breaker past the threshold."""
+        self._failed_polls += 1
+        if self._failed_polls < BREAKER_FAILURE_THRESHOLD:
+            return
+
+        backoff = min(
+            self.poll_interval
+            * 2 ** (self._failed_polls - BREAKER_FAILURE_THRESHOLD + 1),
+            BREAKER_BACKOFF_MAX,
+        )
+        self._breaker_open_until = time.monotonic() + backoff
+        log = (
+            _LOGGER.warning
+            if self._failed_polls == BREAKER_FAILURE_THRESHOLD
+            else _LOGGER.debug
+        )
+        log(
+            "Modbus device at %s:%s failed %d polls in a row, "
+            "pausing polls for %d seconds",
+            self.host,
+            self.port,
+            self._failed_polls,
+            backoff,
+        )
+
+    async def _poll(self, register_keys: set[str]) -> list[Any]:
+        """Fetch data from the Modbus device into the slot store."""
+        self.changed_slots = set()
+        self.batch_timings = []
+        self._polled_batches = set()
+
+        needed_registers = {
+            key
+            for key in map(self.poll_key, register_keys)
+            if self.register_applies(key)
+        }
+
+        if not needed_registers:
+            _LOGGER.debug("No registers requested, skipping Modbus read")
+            return self.slots
+
+        # Re-read the gates of the requested registers on a slow cadence
+        # before planning the poll, so gated groups open/close based on
+        # fresh values
+        gate_registers: set[str] = set()
+        if self._gates_due():
+            gate_registers = {
+                gate["register"]
+                for key in needed_registers
+                if (gate := self.register_map[key].get("gate")) is not None
+                and self.register_applies(gate["register"])
+            }
+
+        # Disconnect before starting to clear any stale data in the buffer
+        # This prevents transaction ID mismatch errors from leftover responses.
+        # Hold the lock so an interactive read in progress is not cut off.
+        async with self._lock.hold(PRIORITY_POLL):
+            await self._disconnect()
+
+        try:
+            if gate_registers:
+                await self._read_batches(
+                    self.plan_batches(gate_registers),
+                    self.changed_slots,
+                    self.batch_timings,
+                    self._polled_batches,
+                )
+                self._gates_checked_at = time.monotonic()
+                _LOGGER.debug("Register gates re-checked: %s", self._gate_values)
+
+            # Skip closed gate groups and registers already read above
+            gated = {key for key in needed_registers if not self._gate_open(key)}
+            poll_registers = needed_registers - gated - gate_registers
+
+            # Group registers into batches for efficient reading
+            batches = self.plan_batches(poll_registers)
+
+            _LOGGER.debug(
+                "Reading %d registers in %d batch(es) (%d skipped by closed gates)",
+                len(poll_registers),
+                len(batches),
+                len(gated),
+            )
+
+            await self._read_batches(
+                batches, self.changed_slots, self.batch_timings, self._polled_batches
+            )
+
+        except TimeoutError as err:
+            # Batches read before the gateway stopped responding keep their values
+            raise GatewayUnavailable(
+                f"Timeout communicating with device: {err}"
+            ) from err
+        except ModbusException as err:
+            raise EngineError(f"Modbus error: {err}") from err
+
+        # Forget payloads of batches not read this poll, so a batch coming back
+        # (e.g. a gate reopening) is decoded and reported again
+        for batch_key in self._batch_payloads.keys() - self._polled_batches:
+            del self._batch_payloads[batch_key]
+            del self._batch_read_at[batch_key]
+
+        # Registers behind closed gates (and the bits of gated bitfields)
+        # are unknown until the gate reopens, and decoded again then
+        for key in gated:
+            bits = self.register_map[key].get("bits", {})
+            for slot in (
+                self.register_slots[key],
+                *(self.register_slots[bit_key] for bit_key in bits),
+            ):
+                self.stale_slots.discard(slot)
+                self._store(slot, None, self.changed_slots)
+            self._forget_raw(key)
+
+        self._update_zone_profiles()
+
+        return self.slots
+
+    def decode_value(self, words: list[int], config: dict[str, Any]) -> Any:
+        """Decode the raw words of one register like a poll does."""
+        return decode_register(words, 0, config)
+
+    def _process_register_value(
+        self,
+        registers: list[int],
+        offset: int,
+        config: dict[str, Any],
+    ) -> Any:
+        """Process raw register values at an offset based on configuration."""
+        return decode_register(registers, offset, config)
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from typing import Any
 
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -17,6 +18,7 @@ class BroetjeEntity(CoordinatorEntity[BroetjeModbusCoordinator]):
 
     _attr_has_entity_name = True
     _register_key: str | None = None
+    _slot: int | None = None
 
     def __init__(
         self,
@@ -43,6 +45,26 @@ class BroetjeEntity(CoordinatorEntity[BroetjeModbusCoordinator]):
             self._attr_entity_category = EntityCategory.DIAGNOSTIC
         self._attr_entity_registry_enabled_default = enabled
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if this entity's register changed in the last poll."""
+        if self._slot is None or self.coordinator.slot_changed(self._slot):
+            super()._handle_coordinator_update()
+
+    @property
+    def available(self) -> bool:
+        """Stay available on failed updates while the cached value is fresh."""
+        return super().available or (
+            self._slot is not None and self.coordinator.value_is_fresh(self._slot)
+        )
+
+    async def async_update(self) -> None:
+        """Refresh only this entity's register (homeassistant.update_entity)."""
+        # Ignore manual update requests if the entity is disabled
+        if not self.enabled or self._register_key is None:
+            return
+        await self.coordinator.async_refresh_register(self._register_key)
+
     @property
     def device_info(self) -> DeviceInfo:
         """Return device information, routing zone entities to sub-devices."""
@@ -72,7 +94,7 @@ class BroetjeEntity(CoordinatorEntity[BroetjeModbusCoordinator]):
         if self._register_key is None:
             return None
 
-        reg_config = self.coordinator.register_map.get(self._register_key)
+        reg_config = self.coordinator.get_register_config(self._register_key)
         if reg_config is None:
             return None
 
@@ -90,4 +112,10 @@ class BroetjeEntity(CoordinatorEntity[BroetjeModbusCoordinator]):
         if bit := reg_config.get("bit"):
             attrs["bit_position"] = bit
 
+        # Only while showing a cached value from before a failed read
+        if self._slot is not None and (
+            read_at := self.coordinator.last_successful_read(self._slot)
+        ):
+            attrs["last_successful_read"] = read_at.isoformat()
+
         return attrs
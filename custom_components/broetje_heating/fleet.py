@@ -0,0 +1,257 @@
+"""Poll many Brötje gateways from a pool of worker processes.
+
+Gateways are sharded across worker processes. Each worker runs one asyncio
+loop with a BroetjeStream per gateway and sends the updates through a
+bounded multiprocessing queue to the aggregating process:
+
+    with FleetPoller(gateways, interval=60) as fleet:
+        for name, update in fleet.updates():
+            ...
+
+or from the command line, writing one JSON object per update:
+
+    python broetje.py fleet gateways.json
+
+A gateway is a dict with "host" and optionally "port", "unit_id",
+"device_type", "zones" and "name" (the same keys as a config entry).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import suppress
+from dataclasses import asdict
+from multiprocessing.process import BaseProcess
+from multiprocessing.queues import Queue
+from multiprocessing.synchronize import Event
+from pathlib import Path
+from queue import Empty, Full
+from typing import Any, Self
+
+from .const import (
+    CONF_UNIT_ID,
+    DEFAULT_PORT,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_UNIT_ID,
+    FLEET_QUEUE_RETRY,
+    FLEET_QUEUE_SIZE,
+    FLEET_STOP_TIMEOUT,
+)
+from .devices import CONF_DEVICE_TYPE, DeviceType
+from .stream import BroetjeStream, StreamUpdate
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def gateway_name(gateway: dict[str, Any]) -> str:
+    """Return the name updates of a gateway are reported under."""
+    return gateway.get("name") or (
+        f"{gateway['host']}:{gateway.get('port', DEFAULT_PORT)}"
+        f"/{gateway.get(CONF_UNIT_ID, DEFAULT_UNIT_ID)}"
+    )
+
+
+async def _poll_gateway(
+    gateway: dict[str, Any],
+    interval: float,
+    deltas: bool,
+    queue: Queue[tuple[str, StreamUpdate]],
+) -> None:
+    """Stream one gateway's updates into the queue."""
+    name = gateway_name(gateway)
+    stream = BroetjeStream(
+        gateway["host"],
+        gateway.get("port", DEFAULT_PORT),
+        DeviceType(gateway.get(CONF_DEVICE_TYPE, DeviceType.ISR)),
+        gateway.get("zones"),
+        gateway.get(CONF_UNIT_ID, DEFAULT_UNIT_ID),
+        interval=interval,
+        deltas=deltas,
+    )
+    try:
+        async for update in stream:
+            # Never block the loop on a full queue: while this stream waits it
+            # is not iterated, so its polls are skipped or merged meanwhile
+            while True:
+                try:
+                    queue.put_nowait((name, update))
+                    break
+                except Full:
+                    await asyncio.sleep(FLEET_QUEUE_RETRY)
+    except Exception:
+        # One broken gateway must not take down the rest of its shard
+        _LOGGER.exception("Polling %s stopped", name)
+
+
+async def _poll_shard(
+    gateways: list[dict[str, Any]],
+    interval: float,
+    deltas: bool,
+    queue: Queue[tuple[str, StreamUpdate]],
+    stop: Event,
+) -> None:
+    """Poll a shard of gateways until the stop event is set."""
+    tasks = [
+        asyncio.create_task(_poll_gateway(gateway, interval, deltas, queue))
+        for gateway in gateways
+    ]
+    await asyncio.get_running_loop().run_in_executor(None, stop.wait)
+
+    # Cancelling a stream closes its connection
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _run_worker(
+    gateways: list[dict[str, Any]],
+    interval: float,
+    deltas: bool,
+    queue: Queue[tuple[str, StreamUpdate]],
+    stop: Event,
+    log_level: int,
+) -> None:
+    """Entry point of a worker process."""
+    # Ctrl+C reaches the whole process group; workers stop via the event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(
+        level=log_level,
+        format="%(asctime)s %(processName)s %(levelname)s %(name)s: %(message)s",
+    )
+    asyncio.run(_poll_shard(gateways, interval, deltas, queue, stop))
+
+
+class FleetPoller:
+    """Poll gateways in worker processes and collect their updates."""
+
+    def __init__(
+        self,
+        gateways: list[dict[str, Any]],
+        *,
+        workers: int | None = None,
+        interval: float = DEFAULT_SCAN_INTERVAL,
+        deltas: bool = True,
+    ) -> None:
+        """Initialize the fleet; workers default to one per CPU core."""
+        self.gateways = gateways
+        self.workers = max(min(workers or os.cpu_count() or 1, len(gateways)), 1)
+        self.interval = interval
+        self.deltas = deltas
+        # Spawned workers start with a fresh interpreter, no inherited loop
+        self._context = multiprocessing.get_context("spawn")
+        self._queue: Queue[tuple[str, StreamUpdate]] = self._context.Queue(
+            FLEET_QUEUE_SIZE
+        )
+        self._stop = self._context.Event()
+        self._processes: list[BaseProcess] = []
+
+    def start(self) -> None:
+        """Start the worker processes."""
+        # Round-robin sharding keeps the shards within one gateway of each other
+        for index in range(self.workers):
+            process = self._context.Process(
+                target=_run_worker,
+                args=(
+                    self.gateways[index :: self.workers],
+                    self.interval,
+                    self.deltas,
+                    self._queue,
+                    self._stop,
+                    logging.getLogger().getEffectiveLevel(),
+                ),
+                name=f"broetje-fleet-{index}",
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+        _LOGGER.info(
+            "Polling %d gateways in %d worker processes",
+            len(self.gateways),
+            self.workers,
+        )
+
+    def updates(self) -> Iterator[tuple[str, StreamUpdate]]:
+        """Yield (gateway name, update) until all workers have stopped."""
+        while True:
+            try:
+                yield self._queue.get(timeout=1)
+            except Empty:
+                if not any(process.is_alive() for process in self._processes):
+                    return
+
+    def stop(self) -> None:
+        """Stop the workers, giving them time to close their connections."""
+        self._stop.set()
+        deadline = time.monotonic() + FLEET_STOP_TIMEOUT
+        while (
+            any(process.is_alive() for process in self._processes)
+            and time.monotonic() < deadline
+        ):
+            # A worker only exits once its queued updates are flushed
+            with suppress(Empty):
+                self._queue.get(timeout=0.1)
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        self._processes.clear()
+
+    def __enter__(self) -> Self:
+        """Start the workers."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop the workers."""
+        self.stop()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Poll the gateways listed in a JSON file and print updates as JSON lines."""
+    parser = argparse.ArgumentParser(
+        prog="python broetje.py fleet",
+        description="Poll many Brötje gateways across worker processes.",
+    )
+    parser.add_argument("gateways", type=Path, help="JSON file with a gateway list")
+    parser.add_argument("--workers", type=int, help="default: one per CPU core")
+    parser.add_argument(
+        "--interval", type=float, default=DEFAULT_SCAN_INTERVAL, help="seconds"
+    )
+    parser.add_argument(
+        "--snapshots", action="store_true", help="full snapshots instead of deltas"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="debug logging")
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(asctime)s %(processName)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    fleet = FleetPoller(
+        json.loads(args.gateways.read_text()),
+        workers=args.workers,
+        interval=args.interval,
+        deltas=not args.snapshots,
+    )
+    with fleet:
+        try:
+            for name, update in fleet.updates():
+                record = asdict(update)
+                record["stale"] = sorted(update.stale)
+                print(json.dumps({"gateway": name, **record}), flush=True)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
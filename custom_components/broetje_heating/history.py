@@ -0,0 +1,126 @@
+"""In-memory ring buffer of raw register words from recent polls."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable
+from typing import Any
+
+# Placeholder word stored for a register not read in a poll. Samples are
+# marked missing by their validity flag, not by this word: it is the "no
+# data" sentinel of numeric registers, but a bitfield or bool would decode
+# it as all bits on
+MISSING_WORD = 0xFFFF
+
+type RegisterReader = Callable[[str, int, int], list[int] | None]
+
+
+def sample_size(register_map: dict[str, dict[str, Any]], registers: list[str]) -> int:
+    """Return the bytes one sample of the registers takes in a history."""
+    width = sum(register_map[key].get("count", 1) for key in registers)
+    return 8 + 2 * width + len(registers)
+
+
+class RegisterHistory:
+    """Raw words of selected registers at every poll, in a fixed memory budget.
+
+    Each sample is a timestamp plus the raw words of every selected register
+    and a flag per register telling whether it was read, stored row by row
+    in flat arrays (float64 timestamps, uint16 words, uint8 flags). Once the
+    budget is full the oldest sample is overwritten.
+    """
+
+    def __init__(
+        self,
+        register_map: dict[str, dict[str, Any]],
+        registers: list[str],
+        budget: int,
+    ) -> None:
+        """Initialize for the given register keys and memory budget in bytes."""
+        self.register_map = register_map
+        self.registers = list(registers)
+        self.budget = budget
+        # Offset and word count of each register within a sample row
+        self._columns: dict[str, tuple[int, int]] = {}
+        width = 0
+        for key in self.registers:
+            count = register_map[key].get("count", 1)
+            self._columns[key] = (width, count)
+            width += count
+        self._width = width
+
+        self.capacity = budget // sample_size(register_map, registers) if width else 0
+        self._timestamps = array("d", bytes(8 * self.capacity))
+        self._words = array("H", bytes(2 * width * self.capacity))
+        self._valid = array("B", bytes(len(self.registers) * self.capacity))
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self._size
+
+    def clear(self) -> None:
+        """Drop all samples held."""
+        self._next = 0
+        self._size = 0
+
+    @property
+    def memory(self) -> int:
+        """Return the bytes allocated for samples."""
+        return len(self._timestamps) * 8 + len(self._words) * 2 + len(self._valid)
+
+    def record(self, timestamp: float, read: RegisterReader) -> None:
+        """Append a sample, taking each register's words from read().
+
+        read(register_type, address, count) returns the raw words of the
+        poll just completed, or None for a register that was not read.
+        """
+        if not self.capacity:
+            return
+        row = array("H")
+        valid = array("B")
+        for key in self.registers:
+            config = self.register_map[key]
+            count = self._columns[key][1]
+            words = read(config["type"], config["address"], count)
+            row.extend(words if words is not None else [MISSING_WORD] * count)
+            valid.append(words is not None)
+
+        start = self._next * self._width
+        self._words[start : start + self._width] = row
+        start = self._next * len(self.registers)
+        self._valid[start : start + len(self.registers)] = valid
+        self._timestamps[self._next] = timestamp
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def _rows(self, since: float | None) -> list[int]:
+        """Return the rows of the samples at or after since, oldest first."""
+        first = (self._next - self._size) % self.capacity if self.capacity else 0
+        rows = [(first + index) % self.capacity for index in range(self._size)]
+        if since is None:
+            return rows
+        return [row for row in rows if self._timestamps[row] >= since]
+
+    def query(
+        self, registers: list[str], since: float | None = None
+    ) -> tuple[list[float], dict[str, list[list[int] | None]]]:
+        """Return the timestamps and each register's raw words, oldest first.
+
+        A register's sample is None for a poll that did not read it.
+        """
+        rows = self._rows(since)
+        words: dict[str, list[list[int] | None]] = {}
+        for key in registers:
+            offset, count = self._columns[key]
+            flag = self.registers.index(key)
+            words[key] = [
+                self._words[
+                    row * self._width + offset : row * self._width + offset + count
+                ].tolist()
+                if self._valid[row * len(self.registers) + flag]
+                else None
+                for row in rows
+            ]
+        return [self._timestamps[row] for row in rows], words
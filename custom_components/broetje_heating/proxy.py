@@ -0,0 +1,135 @@
+"""Local Modbus TCP server sharing the integration's gateway connection.
+
+Other Modbus clients (energy managers, logging scripts) connect here
+instead of to the gateway, which only accepts a few TCP clients. Reads of
+registers covered by the last poll are answered from memory; other reads
+are forwarded over the engine's own connection, queued with its
+interactive requests. Only reading holding (0x03) and input (0x04)
+registers is supported.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import struct
+
+from .const import (
+    BATCH_SIZE_PROTOCOL_MAX,
+    EXC_GATEWAY_PATH,
+    EXC_GATEWAY_TARGET,
+    EXC_ILLEGAL_DATA_VALUE,
+    EXC_ILLEGAL_FUNCTION,
+    PROXY_BIND_HOST,
+    PROXY_MAX_CLIENTS,
+    REG_HOLDING,
+    REG_INPUT,
+)
+from .engine import BroetjeEngine, DeviceExceptionResponse, EngineError
+
+_LOGGER = logging.getLogger(__name__)
+
+# MBAP header: transaction ID, protocol ID, length, unit ID
+_MBAP = struct.Struct(">HHHB")
+_READ_REQUEST = struct.Struct(">BHH")
+_FUNCTION_TYPES = {0x03: REG_HOLDING, 0x04: REG_INPUT}
+
+
+class ModbusProxy:
+    """Modbus TCP server answering reads for one engine's device."""
+
+    def __init__(
+        self, engine: BroetjeEngine, port: int, host: str = PROXY_BIND_HOST
+    ) -> None:
+        """Initialize the proxy; nothing listens until start()."""
+        self.engine = engine
+        self.host = host
+        self.port = port
+        self._server: asyncio.Server | None = None
+        self._clients: set[asyncio.StreamWriter] = set()
+        # Reads answered from the last poll and forwarded to the gateway
+        self.hits = 0
+        self.misses = 0
+
+    async def start(self) -> None:
+        """Start listening; raises OSError if the port is unavailable."""
+        self._server = await asyncio.start_server(
+            self._handle_client, self.host, self.port
+        )
+        _LOGGER.info("Modbus proxy listening on %s:%d", self.host, self.port)
+
+    async def stop(self) -> None:
+        """Stop listening and disconnect all clients."""
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._clients):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+        _LOGGER.info("Modbus proxy on port %d stopped", self.port)
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve the requests of one client connection in order."""
+        peer = writer.get_extra_info("peername")
+        if len(self._clients) >= PROXY_MAX_CLIENTS:
+            _LOGGER.warning("Modbus proxy client limit reached, refusing %s", peer)
+            writer.close()
+            return
+
+        self._clients.add(writer)
+        _LOGGER.debug("Modbus proxy client connected: %s", peer)
+        try:
+            while True:
+                header = await reader.readexactly(_MBAP.size)
+                transaction, protocol, length, unit = _MBAP.unpack(header)
+                if protocol != 0 or not 2 <= length <= 254:
+                    _LOGGER.debug("Invalid MBAP header from %s, closing", peer)
+                    break
+                pdu = await reader.readexactly(length - 1)
+                response = await self._respond(unit, pdu)
+                writer.write(
+                    _MBAP.pack(transaction, 0, len(response) + 1, unit) + response
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+            _LOGGER.debug("Modbus proxy client disconnected: %s", peer)
+
+    async def _respond(self, unit: int, pdu: bytes) -> bytes:
+        """Return the response PDU for a request PDU."""
+        function = pdu[0]
+        if (register_type := _FUNCTION_TYPES.get(function)) is None or len(
+            pdu
+        ) != _READ_REQUEST.size:
+            return bytes((function | 0x80, EXC_ILLEGAL_FUNCTION))
+        _, address, count = _READ_REQUEST.unpack(pdu)
+        if not 1 <= count <= BATCH_SIZE_PROTOCOL_MAX:
+            return bytes((function | 0x80, EXC_ILLEGAL_DATA_VALUE))
+        if unit != self.engine.unit_id:
+            # Only the integration's own device is reachable through the proxy
+            return bytes((function | 0x80, EXC_GATEWAY_PATH))
+        if self.engine.breaker_open:
+            # The last poll's values would be arbitrarily old
+            return bytes((function | 0x80, EXC_GATEWAY_TARGET))
+
+        words = self.engine.cached_registers(register_type, address, count)
+        if words is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            try:
+                words = await self.engine.forward_read(address, count, register_type)
+            except DeviceExceptionResponse as err:
+                return bytes((function | 0x80, err.code))
+            except EngineError:
+                words = None
+            if words is None:
+                return bytes((function | 0x80, EXC_GATEWAY_TARGET))
+
+        return bytes((function, 2 * count)) + struct.pack(f">{count}H", *words)
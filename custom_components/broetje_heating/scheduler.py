@@ -0,0 +1,114 @@
+"""Request and poll scheduling for Brötje Heatpump Modbus connections."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import weakref
+import zlib
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+
+class PriorityLock:
+    """Mutex granting the connection to the most urgent waiter first.
+
+    Waiters are served by priority (lower value first), then in arrival
+    order. Holders release the lock after every Modbus transaction, so a
+    long poll made of many batches is preempted between batches whenever
+    an interactive request is queued. A task can be promoted to a more
+    urgent priority while it waits.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the lock."""
+        self._locked = False
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        # Priority and waiter of every task queued for the lock
+        self._queued: dict[asyncio.Task[Any], tuple[int, asyncio.Future[None]]] = {}
+        # Priorities raised by promote(), for the remaining life of each task
+        self._promoted: weakref.WeakKeyDictionary[asyncio.Task[Any], int] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def locked(self) -> bool:
+        """Return True if the lock is held."""
+        return self._locked
+
+    @asynccontextmanager
+    async def hold(self, priority: int) -> AsyncIterator[None]:
+        """Hold the lock for the duration of the block."""
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: int) -> None:
+        """Wait until the lock is granted to this caller."""
+        task = asyncio.current_task()
+        if task is not None:
+            priority = min(priority, self._promoted.get(task, priority))
+        if not self._locked and not self._waiters:
+            self._locked = True
+            return
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        if task is not None:
+            self._queued[task] = (priority, waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just before being cancelled: pass the lock on
+                self.release()
+            raise
+        finally:
+            if task is not None:
+                self._queued.pop(task, None)
+
+    def promote(self, task: asyncio.Task[Any], priority: int) -> None:
+        """Serve a task's current and later waits at a more urgent priority."""
+        self._promoted[task] = min(priority, self._promoted.get(task, priority))
+        if (queued := self._queued.get(task)) is None or priority >= queued[0]:
+            return
+        waiter = queued[1]
+        self._queued[task] = (priority, waiter)
+        # The entry at the old priority is skipped once the waiter is done
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+
+    def release(self) -> None:
+        """Release the lock and hand it to the most urgent live waiter."""
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                # Ownership passes directly; the lock stays held
+                waiter.set_result(None)
+                return
+        self._locked = False
+
+
+def poll_phase(key: str, interval: float) -> float:
+    """Return a stable offset in [0, interval) for the polls of key.
+
+    Derived from a checksum rather than hash(), so an entry keeps its phase
+    across restarts.
+    """
+    return zlib.crc32(key.encode()) / 2**32 * interval
+
+
+def delay_to_phase(now: float, interval: float, phase: float) -> float:
+    """Return the delay from now to the next poll at phase on the interval grid.
+
+    All polls share one grid (multiples of interval on the same clock), so
+    different phases stay apart. A grid point less than half an interval
+    ahead is skipped, so realigning never polls in quick succession.
+    """
+    delay = (phase - now) % interval
+    if delay < interval / 2:
+        delay += interval
+    return delay
@@ -62,6 +62,9 @@ async def async_setup_entry(
     entities: list[BroetjeSensor] = []
 
     for sensor_key, sensor_config in coordinator.sensors.items():
+        # Skip zone entities that do not apply to the zone's type/function
+        if not coordinator.register_applies(sensor_config["register"]):
+            continue
         entities.append(
             BroetjeSensor(
                 coordinator=coordinator,
@@ -90,6 +93,7 @@ class BroetjeSensor(BroetjeEntity, SensorEntity):
         )
 
         self._register_key = sensor_config["register"]
+        self._slot = coordinator.register_slots[self._register_key]
         self._attr_translation_key = sensor_config.get("translation_key", entity_key)
         self._value_format = sensor_config.get("value_format")
         self._device_categories = sensor_config.get("device_categories", {})
@@ -136,7 +140,7 @@ class BroetjeSensor(BroetjeEntity, SensorEntity):
         if self.coordinator.data is None:
             return None
 
-        value = self.coordinator.data.get(self._register_key)
+        value = self.coordinator.data[self._slot]
 
         if value is None:
             return None
@@ -0,0 +1,166 @@
+"""Services for the Brötje Heatpump integration."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    BURST_DEFAULT_DURATION,
+    BURST_DEFAULT_INTERVAL,
+    BURST_MAX_DURATION,
+    BURST_MAX_INTERVAL,
+    BURST_MIN_INTERVAL,
+    DOMAIN,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import BroetjeModbusCoordinator
+
+SERVICE_GET_HISTORY = "get_history"
+SERVICE_START_BURST = "start_burst"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_REGISTERS = "registers"
+ATTR_DURATION = "duration"
+ATTR_RAW = "raw"
+ATTR_INTERVAL = "interval"
+
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_REGISTERS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_DURATION): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(ATTR_RAW, default=False): cv.boolean,
+    }
+)
+
+START_BURST_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_REGISTERS): vol.All(
+            cv.ensure_list, [cv.string], vol.Length(min=1)
+        ),
+        vol.Optional(ATTR_INTERVAL, default=BURST_DEFAULT_INTERVAL): vol.All(
+            vol.Coerce(float),
+            vol.Range(min=BURST_MIN_INTERVAL, max=BURST_MAX_INTERVAL),
+        ),
+        vol.Optional(ATTR_DURATION, default=BURST_DEFAULT_DURATION): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=BURST_MAX_DURATION)
+        ),
+    }
+)
+
+
+def _get_coordinator(hass: HomeAssistant, entry_id: str) -> BroetjeModbusCoordinator:
+    """Return the coordinator of a loaded config entry of this integration."""
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if (
+        entry is None
+        or entry.domain != DOMAIN
+        or entry.state is not ConfigEntryState.LOADED
+    ):
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_loaded",
+            translation_placeholders={"entry_id": entry_id},
+        )
+    return entry.runtime_data
+
+
+async def _async_get_history(call: ServiceCall) -> ServiceResponse:
+    """Return the recorded samples of registers in the in-memory history."""
+    coordinator = _get_coordinator(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    history = coordinator.history
+    if history is None:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="history_disabled"
+        )
+
+    registers = call.data.get(ATTR_REGISTERS) or history.registers
+    if unknown := [key for key in registers if key not in history.registers]:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="history_register_unknown",
+            translation_placeholders={"registers": ", ".join(unknown)},
+        )
+
+    since = None
+    if duration := call.data.get(ATTR_DURATION):
+        since = time.time() - duration
+    timestamps, words = history.query(registers, since)
+
+    values: dict[str, list] = {}
+    for key, samples in words.items():
+        # None for polls that did not read the register
+        if call.data[ATTR_RAW]:
+            values[key] = [
+                sample[0] if sample is not None and len(sample) == 1 else sample
+                for sample in samples
+            ]
+            continue
+        config = coordinator.register_map[key]
+        values[key] = [
+            None if sample is None else coordinator.engine.decode_value(sample, config)
+            for sample in samples
+        ]
+
+    # Timestamps are seconds since the epoch (UTC), one per recorded poll
+    return {"timestamps": timestamps, "values": values}
+
+
+async def _async_start_burst(call: ServiceCall) -> ServiceResponse:
+    """Start a burst capture of a few registers on a short interval."""
+    coordinator = _get_coordinator(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    if coordinator.burst is not None:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="burst_running"
+        )
+
+    registers = call.data[ATTR_REGISTERS]
+    if unknown := [
+        key
+        for key in registers
+        if key not in coordinator.register_map or not coordinator.register_applies(key)
+    ]:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="register_unknown",
+            translation_placeholders={"registers": ", ".join(unknown)},
+        )
+
+    path = coordinator.async_start_burst(
+        registers, call.data[ATTR_INTERVAL], call.data[ATTR_DURATION]
+    )
+    return {"file": str(path)}
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        _async_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_BURST,
+        _async_start_burst,
+        schema=START_BURST_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,150 @@
+"""Async stream of decoded register values, independent of Home Assistant.
+
+async for update in BroetjeStream(host, port, DeviceType.IWR, [1, 2]):
+    print(update.timestamp, update.values)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from .const import DEFAULT_SCAN_INTERVAL, DEFAULT_UNIT_ID
+from .devices import DeviceType
+from .engine import BroetjeEngine, EngineError
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, kw_only=True)
+class StreamUpdate:
+    """One update of a BroetjeStream."""
+
+    # Wall-clock time the update was read (seconds since the epoch)
+    timestamp: float
+    # All values (snapshot) or only those changed since the last update
+    values: dict[str, Any]
+    delta: bool
+    # Polls folded into this update: more than one in delta mode when
+    # polls found nothing changed
+    polls: int = 1
+    # Scheduled polls not run because the consumer was not ready
+    skipped: int = 0
+    # Registers showing a cached value after a failed read
+    stale: frozenset[str] = field(default_factory=frozenset)
+    # Why the last poll failed, if it did
+    error: str | None = None
+
+
+class BroetjeStream:
+    """Poll a Brötje module on a fixed interval and yield its values.
+
+    Polls are pulled by the consumer: the next poll only runs when the
+    consumer asks for the next update, so nothing queues up behind a slow
+    consumer. Interval ticks that passed while the consumer was busy are
+    skipped (and counted in StreamUpdate.skipped), and in delta mode the
+    changes of every poll since the last update are merged into the next.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        device_type: DeviceType,
+        zones: list[int] | None = None,
+        unit_id: int = DEFAULT_UNIT_ID,
+        *,
+        interval: float = DEFAULT_SCAN_INTERVAL,
+        registers: set[str] | None = None,
+        deltas: bool = False,
+    ) -> None:
+        """Initialize the stream; nothing is read until it is iterated.
+
+        registers limits the poll to a subset of the register map (default:
+        every register that applies to the zones). With deltas, updates only
+        carry values that changed; the first update is a full snapshot.
+        """
+        self.engine = BroetjeEngine(
+            host, port, device_type, zones, unit_id, poll_interval=interval
+        )
+        self.interval = interval
+        self.deltas = deltas
+        self._registers = registers
+        self._keys = list(self.engine.register_slots)
+
+    def __aiter__(self) -> AsyncIterator[StreamUpdate]:
+        """Return an iterator over updates, connecting to the gateway."""
+        return self._updates()
+
+    async def _updates(self) -> AsyncIterator[StreamUpdate]:
+        """Yield one update per poll that has something to report."""
+        loop = asyncio.get_running_loop()
+        try:
+            await self.engine.setup()
+        except EngineError as err:
+            # Polls reconnect on their own; zones are then polled in full
+            _LOGGER.warning("Setup of %s failed: %s", self.engine.host, err)
+
+        registers = self._registers or self.engine.all_registers()
+        # Slots changed by polls not yet reported, None before the first update
+        pending: set[int] | None = None
+        polls = 0
+        skipped = 0
+        next_poll = loop.time()
+
+        try:
+            while True:
+                now = loop.time()
+                missed = max(int((now - next_poll) // self.interval), 0)
+                skipped += missed
+                next_poll += missed * self.interval
+                # Sleeps at least once per poll, so a consumer that never
+                # awaits anything else does not starve the event loop
+                await asyncio.sleep(max(next_poll - now, 0))
+                next_poll += self.interval
+
+                error: str | None = None
+                try:
+                    await self.engine.poll(registers)
+                except EngineError as err:
+                    error = str(err)
+                polls += 1
+
+                if pending is not None:
+                    pending |= self.engine.changed_slots
+                    if self.deltas and not pending and error is None:
+                        continue
+
+                yield self._update(pending, polls, skipped, error)
+                pending = set()
+                polls = 0
+                skipped = 0
+        finally:
+            await self.engine.close()
+
+    def _update(
+        self,
+        changed: set[int] | None,
+        polls: int,
+        skipped: int,
+        error: str | None,
+    ) -> StreamUpdate:
+        """Build an update from the slot store."""
+        slots = self.engine.slots
+        if self.deltas and changed is not None:
+            values = {self._keys[slot]: slots[slot] for slot in sorted(changed)}
+        else:
+            values = self.engine.snapshot()
+        return StreamUpdate(
+            timestamp=time.time(),
+            values=values,
+            delta=self.deltas and changed is not None,
+            polls=polls,
+            skipped=skipped,
+            stale=frozenset(self._keys[slot] for slot in self.engine.stale_slots),
+            error=error,
+        )
@@ -0,0 +1,93 @@
+"""Self-calibrating transport parameters for a Modbus TCP gateway."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .const import (
+    BATCH_TIMEOUT_MAX,
+    BATCH_TIMEOUT_MIN,
+    BATCH_TIMEOUT_RTT_FACTOR,
+    ERROR_RATE_RETRY_THRESHOLDS,
+    ERROR_RATE_SMOOTHING,
+    REQUEST_GAP_DEFAULT,
+    REQUEST_GAP_MAX,
+    REQUEST_GAP_RELAX_AFTER,
+    REQUEST_GAP_STEP,
+    RTT_SMOOTHING,
+)
+
+
+class TransportTuning:
+    """Timeout, retry count and request spacing tuned from observed traffic.
+
+    The timeout follows the smoothed round-trip time. The retry count grows
+    with the smoothed error rate. The minimum gap between requests doubles
+    whenever the gateway shows it is overrun (busy replies, desynced
+    responses) and shrinks again after a run of clean responses.
+    """
+
+    def __init__(
+        self,
+        rtt: float | None = None,
+        error_rate: float = 0.0,
+        gap: float = REQUEST_GAP_DEFAULT,
+    ) -> None:
+        """Initialize from previously stored values, or the defaults."""
+        self.rtt = rtt
+        self.error_rate = error_rate
+        self.gap = gap
+        self._clean_responses = 0
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TransportTuning:
+        """Restore tuning stored with as_dict()."""
+        return cls(
+            rtt=data.get("rtt"),
+            error_rate=data.get("error_rate", 0.0),
+            gap=data.get("gap", REQUEST_GAP_DEFAULT),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the tuning in a JSON-serializable form."""
+        return {"rtt": self.rtt, "error_rate": self.error_rate, "gap": self.gap}
+
+    @property
+    def timeout(self) -> float:
+        """Return the timeout for one transaction."""
+        if self.rtt is None:
+            return BATCH_TIMEOUT_MAX
+        return min(
+            max(self.rtt * BATCH_TIMEOUT_RTT_FACTOR, BATCH_TIMEOUT_MIN),
+            BATCH_TIMEOUT_MAX,
+        )
+
+    @property
+    def retries(self) -> int:
+        """Return how often a transaction without response is retried."""
+        return sum(
+            self.error_rate >= threshold for threshold in ERROR_RATE_RETRY_THRESHOLDS
+        )
+
+    def record_response(self, rtt: float) -> None:
+        """Record a transaction answered after rtt seconds."""
+        if self.rtt is None:
+            self.rtt = rtt
+        else:
+            self.rtt += RTT_SMOOTHING * (rtt - self.rtt)
+        self.error_rate -= ERROR_RATE_SMOOTHING * self.error_rate
+
+        self._clean_responses += 1
+        if self._clean_responses >= REQUEST_GAP_RELAX_AFTER:
+            self._clean_responses = 0
+            self.gap = self.gap / 2 if self.gap > REQUEST_GAP_STEP else 0.0
+
+    def record_error(self) -> None:
+        """Record a transaction that got no usable response."""
+        self.error_rate += ERROR_RATE_SMOOTHING * (1 - self.error_rate)
+        self._clean_responses = 0
+
+    def record_overrun(self) -> None:
+        """Record a busy-rejected or desynced transaction: space requests out."""
+        self.record_error()
+        self.gap = min(max(self.gap * 2, REQUEST_GAP_STEP), REQUEST_GAP_MAX)
@@ -0,0 +1 @@
+"""Tests for the Brötje Heatpump integration."""
@@ -0,0 +1,3 @@
+"""Shared test setup: import the integration's modules without Home Assistant."""
+
+import broetje  # noqa: F401
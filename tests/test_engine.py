@@ -0,0 +1,105 @@
+"""Tests for the polling engine against the pymodbus simulator server.
+
+The engine does not depend on Home Assistant, so these tests only need
+pytest and pymodbus. Each test starts a Modbus TCP server on a free local
+port and counts the read requests it receives.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from pymodbus.datastore import (
+    ModbusDeviceContext,
+    ModbusSequentialDataBlock,
+    ModbusServerContext,
+)
+from pymodbus.pdu import ModbusPDU
+from pymodbus.server import ModbusTcpServer
+
+from custom_components.broetje_heating.const import PRIORITY_POLL
+from custom_components.broetje_heating.devices import DeviceType
+from custom_components.broetje_heating.engine import BroetjeEngine
+
+
+def _free_port() -> int:
+    """Return a local TCP port that is currently free."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _run_with_server(
+    scenario: Callable[[BroetjeEngine, list[ModbusPDU]], Awaitable[Any]],
+) -> Any:
+    """Run a scenario with an engine connected to a simulated gateway."""
+
+    async def run() -> Any:
+        requests: list[ModbusPDU] = []
+
+        def trace(sending: bool, pdu: ModbusPDU) -> ModbusPDU:
+            if not sending:
+                requests.append(pdu)
+            return pdu
+
+        port = _free_port()
+        block = ModbusSequentialDataBlock(1, list(range(1000)))
+        context = ModbusServerContext(
+            devices=ModbusDeviceContext(hr=block), single=True
+        )
+        server = ModbusTcpServer(context, address=("127.0.0.1", port), trace_pdu=trace)
+        await server.serve_forever(background=True)
+        engine = BroetjeEngine("127.0.0.1", port, DeviceType.ISR)
+        try:
+            return await scenario(engine, requests)
+        finally:
+            await engine.close()
+            await server.shutdown()
+
+    return asyncio.run(run())
+
+
+def test_concurrent_reads_are_coalesced() -> None:
+    """Concurrent reads of one range share a single Modbus transaction."""
+
+    async def scenario(engine: BroetjeEngine, requests: list[ModbusPDU]) -> None:
+        results = await asyncio.gather(
+            *(engine.read_registers(100, 4, "holding") for _ in range(3))
+        )
+
+        assert len(requests) == 1
+        assert results[0] == [100, 101, 102, 103]
+        assert all(result is results[0] for result in results)
+
+    _run_with_server(scenario)
+
+
+def test_coalesced_read_takes_most_urgent_priority() -> None:
+    """An interactive caller joining a poll's read is served before the poll."""
+
+    async def scenario(engine: BroetjeEngine, requests: list[ModbusPDU]) -> None:
+        # Hold the connection so the reads below queue up behind it
+        await engine._lock.acquire(PRIORITY_POLL)
+        other = asyncio.create_task(
+            engine.read_registers(200, 2, "holding", PRIORITY_POLL)
+        )
+        await asyncio.sleep(0.01)
+        polled = asyncio.create_task(
+            engine.read_registers(100, 4, "holding", PRIORITY_POLL)
+        )
+        await asyncio.sleep(0.01)
+        interactive = asyncio.create_task(engine.read_registers(100, 4, "holding"))
+        await asyncio.sleep(0.01)
+        engine._lock.release()
+
+        await asyncio.gather(other, polled, interactive)
+
+        # Queued after the other poll read, but promoted ahead of it
+        assert [pdu.address for pdu in requests] == [100, 200]
+        assert polled.result() is interactive.result()
+        assert other.result() == [200, 201]
+
+    _run_with_server(scenario)